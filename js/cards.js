@@ -3,6 +3,7 @@
 import { getState, getRoster } from './state.js';
 import { POS_LABELS, AWARD_ICONS } from './constants.js';
 import { goToYear } from './controls.js';
+import { getPlayerEntry, getSimilar } from './data.js';
 
 let dialog = null;
 let cardName = null;
@@ -11,6 +12,8 @@ let cardMeta = null;
 let cardBadges = null;
 let cardStats = null;
 let cardCareer = null;
+let cardSimilar = null;
+let similarRequest = 0;  // bumped per card so a late table never fills the wrong one
 
 export function initCards() {
   dialog = document.getElementById('player-card');
@@ -20,6 +23,7 @@ export function initCards() {
   cardBadges = document.getElementById('card-badges');
   cardStats = document.getElementById('card-stats');
   cardCareer = document.getElementById('card-career');
+  cardSimilar = document.getElementById('card-similar');
 
   document.getElementById('close-card').addEventListener('click', () => {
     dialog.close();
@@ -30,6 +34,9 @@ export function initCards() {
   });
 }
 
+// Rate stats come as numbers (0.356); show them the way AVG reads (.356)
+const rate = (key) => (p) => p[key].toFixed(3).replace(/^0\./, '.');
+
 // Stat definitions for each role — hero stats shown large, rest in a table
 const HITTER_HERO = [
   { key: 'AVG', label: 'AVG' },
@@ -48,6 +55,10 @@ const HITTER_TABLE = [
   { key: 'BB', label: 'BB' },
   { key: 'SB', label: 'SB' },
   { key: 'AVG', label: 'AVG' },
+  { key: 'OBP', label: 'OBP', format: rate('OBP') },
+  { key: 'SLG', label: 'SLG', format: rate('SLG') },
+  { key: 'OPS', label: 'OPS', format: rate('OPS') },
+  { key: 'OPS+', label: 'OPS+' },
 ];
 
 const STARTER_HERO = [
@@ -64,6 +75,9 @@ const STARTER_TABLE = [
   { key: 'IP', label: 'IP' },
   { key: 'SO', label: 'K' },
   { key: 'BB', label: 'BB' },
+  { key: 'WHIP', label: 'WHIP' },
+  { key: 'K9', label: 'K/9' },
+  { key: 'ERA+', label: 'ERA+' },
 ];
 
 const CLOSER_HERO = [
@@ -80,6 +94,9 @@ const CLOSER_TABLE = [
   { key: 'IP', label: 'IP' },
   { key: 'SO', label: 'K' },
   { key: 'BB', label: 'BB' },
+  { key: 'WHIP', label: 'WHIP' },
+  { key: 'K9', label: 'K/9' },
+  { key: 'ERA+', label: 'ERA+' },
 ];
 
 export function openPlayerCard(player, posLabel, role) {
@@ -96,6 +113,8 @@ export function openPlayerCard(player, posLabel, role) {
     cardBadges.innerHTML = '';
     cardStats.innerHTML = '<p class="card-empty">No stats available for this position.</p>';
     cardCareer.innerHTML = '';
+    cardSimilar.innerHTML = '';
+    similarRequest++;
     dialog.showModal();
     return;
   }
@@ -111,11 +130,12 @@ export function openPlayerCard(player, posLabel, role) {
   buildCardBadges(player, state);
 
   // Pick stat config based on role
-  const heroDefs = role === 'closer' ? CLOSER_HERO
-    : role === 'starter' ? STARTER_HERO
+  const pitcherRole = role === 'reliever' ? 'closer' : role;
+  const heroDefs = pitcherRole === 'closer' ? CLOSER_HERO
+    : pitcherRole === 'starter' ? STARTER_HERO
     : HITTER_HERO;
-  const tableDefs = role === 'closer' ? CLOSER_TABLE
-    : role === 'starter' ? STARTER_TABLE
+  const tableDefs = pitcherRole === 'closer' ? CLOSER_TABLE
+    : pitcherRole === 'starter' ? STARTER_TABLE
     : HITTER_TABLE;
 
   // Build hero stats (big numbers)
@@ -152,7 +172,7 @@ export function openPlayerCard(player, posLabel, role) {
     html += '<table class="card-stat-table"><thead><tr>';
     html += tableStats.map(s => `<th>${s.label}</th>`).join('');
     html += '</tr></thead><tbody><tr>';
-    html += tableStats.map(s => `<td>${player[s.key]}</td>`).join('');
+    html += tableStats.map(s => `<td>${s.format ? s.format(player) : player[s.key]}</td>`).join('');
     html += '</tr></tbody></table>';
   }
 
@@ -170,16 +190,12 @@ export function openPlayerCard(player, posLabel, role) {
 
   // Career years
   buildCareerChips(player, state);
+  buildSimilarChips(player, role, state);
   dialog.showModal();
 }
 
 function buildCareerChips(player, state) {
-  if (!player?.playerID || !state.data?._playerIndex) {
-    cardCareer.innerHTML = '';
-    return;
-  }
-
-  const entry = state.data._playerIndex.get(player.playerID);
+  const entry = getPlayerEntry(state.data, player?.playerID);
   if (!entry || entry.appearances.length <= 1) {
     cardCareer.innerHTML = '';
     return;
@@ -211,6 +227,40 @@ function buildCareerChips(player, state) {
   });
 }
 
+// "Similar seasons" / "Similar careers" from the prebuilt neighbor table,
+// filled in when it arrives
+function buildSimilarChips(player, role, state) {
+  cardSimilar.innerHTML = '';
+  const request = ++similarRequest;
+  getSimilar(player.playerID, role, state.year).then(({ seasons, careers }) => {
+    if (request !== similarRequest) return;
+
+    const nameOf = (id) => getPlayerEntry(state.data, id)?.name ?? id;
+    const lastYear = (id) => getPlayerEntry(state.data, id)?.appearances
+      .reduce((max, a) => Math.max(max, a.year), 0);
+    const chips = (items) => items
+      .filter(([, y]) => y)
+      .map(([label, y]) => `<button class="career-chip" data-year="${y}">${label}</button>`)
+      .join('');
+
+    const seasonChips = chips(seasons.map(([id, y]) => [`${nameOf(id)} ${y}`, y]));
+    const careerChips = chips(careers.map(id => [nameOf(id), lastYear(id)]));
+    cardSimilar.innerHTML = [
+      seasonChips && `<div class="career-heading">Similar Seasons</div>
+        <div class="career-years">${seasonChips}</div>`,
+      careerChips && `<div class="career-heading">Similar Careers</div>
+        <div class="career-years">${careerChips}</div>`,
+    ].filter(Boolean).join('');
+
+    cardSimilar.querySelectorAll('.career-chip').forEach(chip => {
+      chip.addEventListener('click', () => {
+        dialog.close();
+        goToYear(Number(chip.dataset.year));
+      });
+    });
+  });
+}
+
 function buildCardBadges(player, state) {
   const badges = [];
 
@@ -229,21 +279,12 @@ function buildCardBadges(player, state) {
     }
   }
 
-  // Aggregate career awards from player index
-  if (player.playerID && state.data?._playerIndex) {
-    const entry = state.data._playerIndex.get(player.playerID);
+  // Career award totals from the player's search entry
+  if (player.playerID) {
+    const entry = getPlayerEntry(state.data, player.playerID);
     if (entry) {
-      const careerAwards = {};
-      for (const app of entry.appearances) {
-        const p = app.player;
-        if (p.awards) {
-          for (const code of p.awards) {
-            careerAwards[code] = (careerAwards[code] || 0) + 1;
-          }
-        }
-      }
       const careerParts = [];
-      for (const [code, count] of Object.entries(careerAwards)) {
+      for (const [code, count] of Object.entries(entry.awards)) {
         if (count > 1) {
           const info = AWARD_ICONS[code];
           if (info) careerParts.push(`${count}x ${info.label}`);
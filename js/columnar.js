@@ -0,0 +1,69 @@
+/* Columnar — Typed-array reader for the binary export (yankees.columns.bin) */
+
+import { assetUrl } from './data.js';
+
+// Layout is documented next to write_columnar() in scripts/extract_yankees.py.
+// Cells are little-endian; typed arrays are views over the fetched buffer.
+
+const MAGIC = 'BXW1';
+const VERSION = 1;
+const HEADER_SIZE = 16;
+const DIRENT_SIZE = 24;
+
+const KINDS = {
+  i: { Array: Int32Array, nullValue: -(2 ** 31) },
+  h: { Array: Int16Array, nullValue: -(2 ** 15) },
+  s: { Array: Uint32Array, nullValue: null },
+};
+
+export async function loadColumnar(url = 'data/yankees.columns.bin') {
+  const res = await fetch(assetUrl(url));
+  if (!res.ok) throw new Error(`Failed to load columns: ${res.status}`);
+  return parseColumnar(await res.arrayBuffer());
+}
+
+// Returns { rows, columns: { name -> TypedArray }, scales, nulls, string(id) }
+export function parseColumnar(buffer) {
+  const view = new DataView(buffer);
+  const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4));
+  const version = view.getUint16(4, true);
+  if (magic !== MAGIC || version !== VERSION) {
+    throw new Error(`Not a version ${VERSION} columnar export`);
+  }
+  const ncols = view.getUint16(6, true);
+  const rows = view.getUint32(8, true);
+  const nstrings = view.getUint32(12, true);
+
+  const ascii = new TextDecoder('ascii');
+  const columns = {};
+  const scales = {};
+  const nulls = {};
+  for (let c = 0; c < ncols; c++) {
+    const at = HEADER_SIZE + c * DIRENT_SIZE;
+    const name = ascii.decode(new Uint8Array(buffer, at, 16)).replace(/\0+$/, '');
+    const kind = KINDS[String.fromCharCode(view.getUint8(at + 16))];
+    columns[name] = new kind.Array(buffer, view.getUint32(at + 20, true), rows);
+    scales[name] = view.getUint8(at + 17);
+    nulls[name] = kind.nullValue;
+  }
+
+  // String table: decoded on demand, so unused names never become JS strings
+  const offsetsAt = HEADER_SIZE + ncols * DIRENT_SIZE;
+  const offsets = new Uint32Array(buffer, offsetsAt, nstrings + 1);
+  const blob = new Uint8Array(buffer, offsetsAt + 4 * (nstrings + 1));
+  const utf8 = new TextDecoder();
+  const cache = new Map();
+  const string = (id) => {
+    if (!cache.has(id)) cache.set(id, utf8.decode(blob.subarray(offsets[id], offsets[id + 1])));
+    return cache.get(id);
+  };
+
+  return { rows, columns, scales, nulls, string };
+}
+
+// Real value of a numeric cell (null when missing)
+export function cellValue(table, name, row) {
+  const raw = table.columns[name][row];
+  if (raw === table.nulls[name]) return null;
+  return raw / 10 ** table.scales[name];
+}
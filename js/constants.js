@@ -55,6 +55,8 @@ export const POS_LABELS = {
   LF: 'Left Field',
   CF: 'Center Field',
   RF: 'Right Field',
+  BN: 'Bench',
+  RP: 'Relief Pitcher',
 };
 
 // WS banner messages — a bit of fun
@@ -83,7 +85,7 @@ export const AWARD_ICONS = {
 // Node stat lines — returns array of strings for the node bubble
 export function getNodeStats(player, role) {
   if (!player) return [];
-  if (role === 'closer') {
+  if (role === 'closer' || role === 'reliever') {
     const lines = [];
     if (player.SV != null) lines.push(`${player.SV} SV`);
     if (player.ERA != null) lines.push(`${player.ERA} ERA`);
@@ -2,6 +2,7 @@
 
 import { getState, setState, subscribe, getRoster, getEra, getEraQuote } from './state.js';
 import { popYearPill } from './animations.js';
+import { ensureYear, prefetchAround } from './data.js';
 import {
   WS_WON_MESSAGES, WS_LOST_MESSAGES,
 } from './constants.js';
@@ -108,17 +109,34 @@ function shiftYear(dir) {
   const idx = state.years.indexOf(state.year);
   const next = Math.max(0, Math.min(state.years.length - 1, idx + dir));
   if (state.years[next] !== state.year) {
-    setState({ year: state.years[next] });
+    selectYear(state.years[next]);
   }
 }
 
 function goToYear(year) {
   const state = getState();
   if (state.years.includes(year)) {
-    setState({ year });
+    selectYear(year);
   }
 }
 
+// Every year change goes through here so a sharded season is fetched before
+// it renders; a newer request supersedes one still loading.
+let requestedYear = null;
+
+async function selectYear(year) {
+  requestedYear = year;
+  try {
+    await ensureYear(year);
+  } catch (err) {
+    console.error(`Failed to load ${year}:`, err);
+    return;
+  }
+  if (requestedYear !== year) return;
+  setState({ year });
+  prefetchAround(year);
+}
+
 // --- Keyboard ---
 
 function bindKeyboard() {
@@ -135,11 +153,11 @@ function bindKeyboard() {
     } else if (e.key === 'Home') {
       e.preventDefault();
       const state = getState();
-      if (state.years.length) setState({ year: state.years[0] });
+      if (state.years.length) selectYear(state.years[0]);
     } else if (e.key === 'End') {
       e.preventDefault();
       const state = getState();
-      if (state.years.length) setState({ year: state.years[state.years.length - 1] });
+      if (state.years.length) selectYear(state.years[state.years.length - 1]);
     }
   });
 }
@@ -170,7 +188,7 @@ function bindTimeline() {
     const state = getState();
     const idx = Number(els.timeline.value);
     if (state.years[idx] != null) {
-      setState({ year: state.years[idx] });
+      selectYear(state.years[idx]);
     }
   });
 }
@@ -199,17 +217,21 @@ function buildTimelineMarkers() {
   els.timelineMarkers.innerHTML = '';
   const total = state.years.length - 1;
 
+  // From the top-level WS lists, since sharded seasons may not be loaded yet
+  const wsWon = new Set(state.data.wsWon || []);
+  const wsLost = new Set(state.data.wsLost || []);
+
   for (let i = 0; i < state.years.length; i++) {
     const year = state.years[i];
-    const roster = state.data.years[String(year)];
-    if (!roster?.worldSeries) continue;
+    const won = wsWon.has(year);
+    if (!won && !wsLost.has(year)) continue;
 
     const pct = (i / total) * 100;
     const marker = document.createElement('div');
     marker.className = 'timeline-marker';
-    if (roster.worldSeries === 'lost') marker.classList.add('ws-lost-marker');
+    if (!won) marker.classList.add('ws-lost-marker');
     marker.style.left = `${pct}%`;
-    marker.title = `${year} — ${roster.worldSeries === 'won' ? 'WS Champions' : 'WS Loss'}`;
+    marker.title = `${year} — ${won ? 'WS Champions' : 'WS Loss'}`;
     els.timelineMarkers.appendChild(marker);
   }
 }
@@ -307,19 +329,32 @@ function buildLeaderboards() {
   const lb = state.data?.leaderboards;
   if (!lb || !els.leaderboards) return;
 
+  // Boards come from LEADERBOARDS in extract_yankees.py; older data files
+  // only carry the first four, so missing boards are skipped
   const categories = [
     { key: 'mvp', title: 'Most MVPs', icon: '\u{1F3C5}' },
     { key: 'cyYoung', title: 'Most Cy Youngs', icon: '\u{1F3C6}' },
     { key: 'allStar', title: 'Most All-Stars', icon: '\u2B50' },
     { key: 'wsWins', title: 'Most WS Wins', icon: '\u{1F48D}' },
-  ];
+    { key: 'careerHR', title: 'Career Home Runs', icon: '\u26BE' },
+    { key: 'careerH', title: 'Career Hits', icon: '\u26BE' },
+    { key: 'careerRBI', title: 'Career RBI', icon: '\u26BE' },
+    { key: 'careerW', title: 'Career Wins', icon: '\u{1F94E}' },
+    { key: 'careerSO', title: 'Career Strikeouts', icon: '\u{1F94E}' },
+    { key: 'careerSV', title: 'Career Saves', icon: '\u{1F94E}' },
+    { key: 'seasonHR', title: 'Season Home Runs', icon: '\u{1F4C5}' },
+    { key: 'seasonRBI', title: 'Season RBI', icon: '\u{1F4C5}' },
+    { key: 'seasonW', title: 'Season Wins', icon: '\u{1F4C5}' },
+    { key: 'seasonSO', title: 'Season Strikeouts', icon: '\u{1F4C5}' },
+    { key: 'seasonSV', title: 'Season Saves', icon: '\u{1F4C5}' },
+  ].filter(cat => lb[cat.key]);
 
   els.leaderboards.innerHTML = categories.map(cat => {
-    const entries = lb[cat.key] || [];
+    const entries = lb[cat.key];
     const listHtml = entries.map((e, i) => `
       <li class="leaderboard-entry">
         <span class="leaderboard-rank">${i + 1}.</span>
-        <span class="leaderboard-name">${e.name}</span>
+        <span class="leaderboard-name">${e.name}${e.year ? ` <span class="leaderboard-year">${e.year}</span>` : ''}</span>
         <span class="leaderboard-count">${e.count}</span>
       </li>
     `).join('');
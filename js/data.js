@@ -1,58 +1,211 @@
 /* Data — Loading & Indexing */
 
-import { setState } from './state.js';
+import { getState, setState, hydrateRoster } from './state.js';
+import { loadColumnar } from './columnar.js';
 
 const DATA_URL = 'data/yankees.json';
 
+// Sharded build (extract_yankees.py --shard): a small manifest plus one file
+// per season, so the first roster renders without downloading every year.
+const MANIFEST_URL = 'data/yankees/manifest.json';
+
+// Prebuilt by extract_yankees.py: players sorted by seasons, plus trigram and
+// word-prefix posting lists over accent-folded name + nickname.
+const SEARCH_URL = 'data/yankees-search.json';
+// Prebuilt by extract_yankees.py: each player's nearest seasons and careers,
+// fetched the first time a card asks for them.
+const SIMILAR_URL = 'data/yankees-similar.json';
+// Written by every extract_yankees.py build: which layout it produced, and
+// with --publish, logical name -> content-hashed copy. Revalidated every
+// visit; the hashed files never change.
+const ASSET_MANIFEST_URL = 'data/asset-manifest.json';
+const MAX_RESULTS = 50;
+const PREFETCH_RADIUS = 2;
+const BACKFILL_CONCURRENCY = 4;
+
+const pending = new Map();  // year -> Promise of an in-flight shard fetch
+let assets = {};            // logical path under data/ -> hashed path
+let similar = null;         // Promise of the similar-players table
+
 export async function loadData() {
-  const res = await fetch(DATA_URL);
-  if (!res.ok) throw new Error(`Failed to load data: ${res.status}`);
-  const data = await res.json();
+  const built = await fetchJson(ASSET_MANIFEST_URL, { cache: 'no-cache' }).catch(() => null);
+  assets = built?.assets ?? {};
+
+  // The build names its layout; only builds that predate it need probing.
+  const layout = built?.layouts?.[DATA_URL.slice('data/'.length)];
+  const manifestUrl = assetUrl(MANIFEST_URL);
+  const manifest = layout === 'single' ? null : await fetchJson(manifestUrl).catch(() => null);
+  const data = manifest ?? await fetchJson(assetUrl(DATA_URL));
 
-  const years = Object.keys(data.years)
+  if (manifest) {
+    data.years = {};
+    data._shardBase = new URL('.', new URL(manifestUrl, document.baseURI));
+  }
+  if (data.players) hydrateLeaderboards(data);
+
+  const years = Object.keys(manifest ? manifest.seasons : data.years)
     .map(Number)
     .filter(Number.isFinite)
     .sort((a, b) => a - b);
 
-  // Build player index for search: { name -> [{ year, pos, role, player }] }
-  data._playerIndex = buildPlayerIndex(data);
+  // Search index loads alongside first render; without it, search and cards
+  // fall back to indexing the loaded seasons. Sharded builds index every
+  // season from the columnar export, or failing that backfill the shards.
+  fetchJson(assetUrl(SEARCH_URL))
+    .then(index => { data._searchIndex = index; })
+    .catch(() => {
+      if (!manifest) return;
+      loadColumnar()
+        .then(table => { data._playerIndex = columnarPlayerIndex(table); })
+        .catch(() => backfillYears(data, years));
+    });
+
+  const year = years[years.length - 1];  // Start at most recent
+  if (manifest) await ensureYear(year, data);
 
   setState({
     data,
     years,
-    year: years[years.length - 1],  // Start at most recent
+    year,
     loaded: true,
   });
 
+  if (manifest) prefetchAround(year);
+
   return data;
 }
 
-function buildPlayerIndex(data) {
-  const index = new Map();
+// Hashed URL for a data/ asset when published, else the plain one
+export function assetUrl(url) {
+  const hashed = assets[url.replace(/^data\//, '')];
+  return hashed ? `data/${hashed}` : url;
+}
 
-  for (const [yearStr, roster] of Object.entries(data.years)) {
-    const year = Number(yearStr);
+async function fetchJson(url, init) {
+  const res = await fetch(url, init);
+  if (!res.ok) throw new Error(`Failed to load data: ${res.status}`);
+  return res.json();
+}
 
-    // Position players
-    for (const [pos, player] of Object.entries(roster.position_players || {})) {
-      addToIndex(index, player, year, pos, 'hitter');
+// Normalized layout: leaderboard rows point at data.players like seasons do
+function hydrateLeaderboards(data) {
+  for (const entries of Object.values(data.leaderboards || {})) {
+    for (const e of entries) {
+      if (e.p == null) continue;
+      e.playerID = data.players[e.p].playerID;
+      e.name = data.players[e.p].name;
     }
+  }
+}
 
-    // Starters
-    for (let i = 0; i < (roster.pitchers?.starters || []).length; i++) {
-      const sp = roster.pitchers.starters[i];
-      addToIndex(index, sp, year, `SP${i + 1}`, 'starter');
-    }
+// Resolve once the roster for `year` is in data.years (no-op when unsharded)
+export function ensureYear(year, data = getState().data) {
+  const key = String(year);
+  if (!data?.seasons || data.years[key]) return Promise.resolve();
+  if (!data.seasons[key]) return Promise.resolve();
+
+  if (!pending.has(key)) {
+    const url = new URL(data.seasons[key], data._shardBase);
+    pending.set(key, fetchJson(url)
+      .then(roster => {
+        data.years[key] = roster;
+        if (data._playerIndex && !data._playerIndex.complete) {
+          addRosterToIndex(data._playerIndex, Number(key), hydrateRoster(roster, data));
+        }
+      })
+      .finally(() => pending.delete(key)));
+  }
+  return pending.get(key);
+}
 
-    // Closer
-    if (roster.pitchers?.closer) {
-      addToIndex(index, roster.pitchers.closer, year, 'CL', 'closer');
+// Warm the seasons next to `year` so arrow/swipe navigation stays instant
+export function prefetchAround(year) {
+  const { years, data } = getState();
+  if (!data?.seasons) return;
+  const idx = years.indexOf(year);
+  for (let d = 1; d <= PREFETCH_RADIUS; d++) {
+    for (const y of [years[idx - d], years[idx + d]]) {
+      if (y != null) ensureYear(y, data).catch(() => {});
     }
   }
+}
+
+// Fetch the remaining seasons in the background so search covers every year
+function backfillYears(data, years) {
+  const queue = years.filter(y => !data.years[String(y)]).reverse();
+  const idle = window.requestIdleCallback ?? (fn => setTimeout(fn, 200));
+
+  const next = () => {
+    const y = queue.shift();
+    if (y == null) return;
+    ensureYear(y, data).catch(() => {}).then(() => idle(next));
+  };
+  idle(() => {
+    for (let i = 0; i < BACKFILL_CONCURRENCY; i++) next();
+  });
+}
 
+// Fallback index over loaded seasons: { id -> { name, appearances } }, built
+// on first use only when the prebuilt search index is unavailable
+function getPlayerIndex(data) {
+  if (!data._playerIndex) data._playerIndex = buildPlayerIndex(data);
+  return data._playerIndex;
+}
+
+function buildPlayerIndex(data) {
+  const index = new Map();
+
+  for (const [yearStr, roster] of Object.entries(data.years)) {
+    addRosterToIndex(index, Number(yearStr), hydrateRoster(roster, data));
+  }
+
+  return index;
+}
+
+// Same index over every season in the columnar export; complete, so loading
+// shards later adds nothing to it
+function columnarPlayerIndex(table) {
+  const { columns, string } = table;
+  const index = new Map();
+  for (let r = 0; r < table.rows; r++) {
+    const player = {
+      playerID: string(columns.playerID[r]) || undefined,
+      name: string(columns.name[r]),
+      nickname: string(columns.nickname[r]) || undefined,
+      awards: string(columns.awards[r]).split(',').filter(Boolean),
+    };
+    addToIndex(index, player, columns.year[r], string(columns.pos[r]), string(columns.role[r]));
+  }
+  index.complete = true;
   return index;
 }
 
+function addRosterToIndex(index, year, roster) {
+  // Position players
+  for (const [pos, player] of Object.entries(roster.position_players || {})) {
+    addToIndex(index, player, year, pos, 'hitter');
+  }
+
+  // Starters
+  for (let i = 0; i < (roster.pitchers?.starters || []).length; i++) {
+    const sp = roster.pitchers.starters[i];
+    addToIndex(index, sp, year, `SP${i + 1}`, 'starter');
+  }
+
+  // Closer
+  if (roster.pitchers?.closer) {
+    addToIndex(index, roster.pitchers.closer, year, 'CL', 'closer');
+  }
+
+  // Bench and bullpen (full-roster builds only)
+  for (const player of roster.bench || []) {
+    addToIndex(index, player, year, 'BN', 'bench');
+  }
+  for (const rp of roster.pitchers?.bullpen || []) {
+    addToIndex(index, rp, year, 'RP', 'reliever');
+  }
+}
+
 function addToIndex(index, player, year, pos, role) {
   if (!player?.name) return;
   const key = player.playerID || player.name.toLowerCase();
@@ -62,19 +215,121 @@ function addToIndex(index, player, year, pos, role) {
   index.get(key).appearances.push({ year, pos, role, player });
 }
 
-// Search players by name across all years
+// Same folding as normalize_name() in scripts/extract_yankees.py
+export function normalizeName(text) {
+  return text
+    .normalize('NFKD')
+    .replace(/[\u0300-\u036f]/g, '')
+    .toLowerCase()
+    .replace(/[^a-z0-9]+/g, ' ')
+    .trim();
+}
+
+// Search players by name (or nickname) across all years.
+// Entries: { name, appearances: [{ year, pos, role }], awards: { code: n } }
 export function searchPlayersInData(data, query) {
-  const q = query.trim().toLowerCase();
-  if (!q || !data?._playerIndex) return [];
+  if (!data) return [];
+  if (data._searchIndex) return searchIndex(data._searchIndex, query);
+
+  const q = normalizeName(query);
+  if (!q) return [];
 
   const results = [];
-  for (const [, entry] of data._playerIndex) {
-    if (entry.name.toLowerCase().includes(q)) {
+  for (const [, entry] of getPlayerIndex(data)) {
+    const nickname = entry.appearances[0].player.nickname ?? '';
+    if (normalizeName(`${entry.name} ${nickname}`).includes(q)) {
       results.push(entry);
     }
   }
 
   // Sort by number of appearances (most appearances first)
   results.sort((a, b) => b.appearances.length - a.appearances.length);
-  return results.slice(0, 50);
+  return results.slice(0, MAX_RESULTS).map(toEntry);
+}
+
+function searchIndex(index, query) {
+  const q = normalizeName(query);
+  if (!q) return [];
+
+  let hits;
+  if (q.length < 3) {
+    hits = index.prefixes[q] ?? [];
+  } else {
+    const lists = [];
+    for (let i = 0; i + 3 <= q.length; i++) {
+      const list = index.grams[q.slice(i, i + 3)];
+      if (!list) return [];
+      lists.push(list);
+    }
+    lists.sort((a, b) => a.length - b.length);
+    hits = lists.reduce(intersectSorted);
+    // Trigrams can co-occur without the full query being adjacent
+    hits = hits.filter(i => index.players[i].key.includes(q));
+  }
+
+  // Posting lists are in player order, i.e. most seasons first
+  return hits.slice(0, MAX_RESULTS).map(i => indexedEntry(index.players[i]));
+}
+
+function intersectSorted(a, b) {
+  const out = [];
+  let i = 0;
+  let j = 0;
+  while (i < a.length && j < b.length) {
+    if (a[i] === b[j]) { out.push(a[i]); i++; j++; }
+    else if (a[i] < b[j]) i++;
+    else j++;
+  }
+  return out;
+}
+
+function indexedEntry(rec) {
+  if (!rec._entry) {
+    rec._entry = {
+      name: rec.name,
+      appearances: rec.apps.map(([year, pos, role]) => ({ year, pos, role })),
+      awards: rec.awards,
+    };
+  }
+  return rec._entry;
+}
+
+// Normalize a fallback-index entry to the search/card shape. Recounted on
+// every call because sharded seasons keep adding appearances.
+function toEntry(entry) {
+  entry.awards = {};
+  for (const app of entry.appearances) {
+    for (const code of app.player.awards || []) {
+      entry.awards[code] = (entry.awards[code] || 0) + 1;
+    }
+  }
+  return entry;
+}
+
+// Players most like `playerID` in `role`: { seasons: [[id, year]] nearest to
+// his `year`, careers: [id] nearest to his whole career } (empty when unknown)
+export function getSimilar(playerID, role, year) {
+  similar ??= fetchJson(assetUrl(SIMILAR_URL)).catch(() => null);
+  const pool = role === 'hitter' || role === 'bench' ? 'hitter' : 'pitcher';
+  return similar.then(table => ({
+    seasons: table?.[pool].seasons[playerID]?.[year] ?? [],
+    careers: table?.[pool].careers[playerID] ?? [],
+  }));
+}
+
+// Career entry for one player, for the card's career chips and award totals
+export function getPlayerEntry(data, playerID) {
+  if (!data || !playerID) return null;
+
+  const index = data._searchIndex;
+  if (index) {
+    if (!index._byId) {
+      index._byId = new Map(index.players.map((rec, i) => [rec.id, i]));
+    }
+    const i = index._byId.get(playerID);
+    return i == null ? null : indexedEntry(index.players[i]);
+  }
+
+  const entry = getPlayerIndex(data).get(playerID);
+  return entry ? toEntry(entry) : null;
 }
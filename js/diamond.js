@@ -7,10 +7,12 @@ import { openPlayerCard } from './cards.js';
 
 let container = null;
 let diamondEl = null;
+let benchEl = null;
 
 export function initDiamond() {
   container = document.getElementById('diamond-nodes');
   diamondEl = document.getElementById('diamond');
+  benchEl = document.getElementById('bench-strip');
 
   subscribe('year', () => renderDiamond());
   subscribe('loaded', () => renderDiamond());
@@ -62,6 +64,33 @@ function renderDiamond() {
 
     animateEntrance(container);
   });
+
+  renderBench(roster);
+}
+
+// Full-roster builds: everyone off the diamond, as a strip of chips
+function renderBench(roster) {
+  if (!benchEl) return;
+  const players = [
+    ...(roster?.bench ?? []).map(p => [p, 'BN', 'bench']),
+    ...(roster?.pitchers?.bullpen ?? []).map(p => [p, 'RP', 'reliever']),
+  ];
+  benchEl.innerHTML = '';
+  benchEl.hidden = !players.length;
+
+  for (const [player, posLabel, role] of players) {
+    const chip = document.createElement('button');
+    chip.className = 'bench-chip';
+    const stat = getNodeStats(player, role)[0] ?? '';
+    chip.innerHTML = `
+      <span class="bench-pos">${posLabel}</span>
+      <span class="bench-name">${escapeHtml(player.name)}</span>
+      <span class="bench-stat">${escapeHtml(stat)}</span>
+    `;
+    chip.addEventListener('click', () => openPlayerCard(player, posLabel, role));
+    chip.setAttribute('aria-label', `${posLabel}: ${player.name}`);
+    benchEl.appendChild(chip);
+  }
 }
 
 function createNode(coord, player, posLabel, role, isWS) {
@@ -56,7 +56,39 @@ export function subscribe(key, fn) {
 // Get the roster for a given year
 export function getRoster(year) {
   const y = year ?? state.year;
-  return state.data?.years?.[String(y)] ?? null;
+  return hydrateRoster(state.data?.years?.[String(y)] ?? null);
+}
+
+// Normalized layout (the extract_yankees.py default): each season entry
+// holds "p", a row in data.players with the career-constant fields. Expand
+// a roster in place the first time it is read, so only visited seasons pay.
+export function hydrateRoster(roster, data = state.data) {
+  if (!roster || !data?.players || roster._hydrated) return roster;
+
+  const players = data.players;
+  const pp = roster.position_players || {};
+  for (const pos of Object.keys(pp)) {
+    pp[pos] = expandEntry(pp[pos], players);
+  }
+  const pitchers = roster.pitchers || {};
+  pitchers.starters = (pitchers.starters || []).map(sp => expandEntry(sp, players));
+  if (pitchers.closer) pitchers.closer = expandEntry(pitchers.closer, players);
+  // Full-roster builds (extract_yankees.py --full-roster)
+  if (roster.bench) roster.bench = roster.bench.map(p => expandEntry(p, players));
+  if (pitchers.bullpen) pitchers.bullpen = pitchers.bullpen.map(rp => expandEntry(rp, players));
+
+  roster._hydrated = true;
+  return roster;
+}
+
+function expandEntry(entry, players) {
+  if (entry?.p == null) return entry;
+  const { p, ...stats } = entry;
+  const full = { ...players[p], ...stats };
+  if (full.IPouts != null && full.IP == null) {
+    full.IP = `${Math.floor(full.IPouts / 3)}.${full.IPouts % 3}`;
+  }
+  return full;
 }
 
 // Get era info for a year
@@ -0,0 +1,474 @@
+#!/usr/bin/env python3
+"""Benchmark extract_yankees.py on synthetic Lahman-shaped inputs.
+
+Generates Batting.csv, Pitching.csv, the four Lahman .RData tables and a
+core_rosters JSON at a multiple of today's Lahman size (1x is ~155 seasons
+of 24 clubs), then times each pipeline stage and records its peak memory.
+On the machine that recorded benchmark_baseline.json a slowdown against
+it fails the run; elsewhere the baseline is only shown.  Everything is generated locally; no Lahman download is needed."""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import extract_yankees as ey
+
+BASELINE = os.path.join(ey.SCRIPT_DIR, "benchmark_baseline.json")
+BENCH_DIR = os.path.join(ey.CACHE_DIR, "bench")
+BENCH_CACHE_DIR = os.path.join(BENCH_DIR, "cache")  # anything a stage caches, never the build's
+GENERATOR_VERSION = 3  # bump when generated inputs change shape
+
+SCALES = [1, 10, 100]
+STAGES = ["source", "batting", "pitching", "lahman", "derived", "enrich", "leaderboards",
+          "serialize", "columnar", "search", "similar", "sqlite", "inputs"]
+
+# 1x mirrors the current Lahman release: ~115k batting and ~52k pitching rows
+FIRST_YEAR = 1871
+LAST_YEAR = 2025
+CLUBS_PER_YEAR = 24
+BATTERS_PER_CLUB = 30
+PITCHERS_PER_CLUB = 14
+POSITIONS = ["C", "1B", "2B", "3B", "SS", "LF", "CF", "RF"]
+
+BATTING_HEADER = ["playerID", "yearID", "stint", "teamID", "lgID", "G", "AB", "R", "H",
+                  "2B", "3B", "HR", "RBI", "SB", "CS", "BB", "SO", "IBB", "HBP", "SH",
+                  "SF", "GIDP"]
+PITCHING_HEADER = ["playerID", "yearID", "stint", "teamID", "lgID", "W", "L", "G", "GS",
+                   "CG", "SHO", "SV", "IPouts", "H", "ER", "HR", "BB", "SO", "BAOpp",
+                   "ERA", "IBB", "WP", "HBP", "BK", "BFP", "GF", "R", "SH", "SF", "GIDP"]
+
+# A stage may take this much longer (or use this much more memory) than the
+# baseline before the run fails; slowdowns under MIN_SECONDS are noise
+TIME_TOLERANCE = 0.25
+MEMORY_TOLERANCE = 0.25
+MIN_SECONDS = 0.005
+REPEAT = 3  # runs per scale; the fastest (and smallest) of each stage is kept
+
+
+# --- Synthetic inputs ---
+
+def club_ids(scale):
+    """NYA plus enough synthetic teamIDs to fill CLUBS_PER_YEAR * scale."""
+    return ["NYA"] + [f"S{n:04d}" for n in range(1, CLUBS_PER_YEAR * scale)]
+
+
+def player_id(team, role, slot, year):
+    """Stable ID for a roster slot; players hold a slot for about six seasons."""
+    return f"{team.lower()}{role}{slot:02d}{(year + slot) // 6:03d}"
+
+
+def generate(directory, scale, seed=0):
+    """Write one scale's inputs under directory; returns the path map."""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    clubs = club_ids(scale)
+    years = range(FIRST_YEAR, LAST_YEAR + 1)
+    paths = {
+        "source": os.path.join(directory, "core_rosters.json"),
+        "batting": os.path.join(directory, "Batting.csv"),
+        "pitching": os.path.join(directory, "Pitching.csv"),
+        "lahman": os.path.join(directory, "lahman"),
+    }
+    os.makedirs(paths["lahman"], exist_ok=True)
+
+    # CSVs one season at a time so 100x stays within memory
+    with open(paths["batting"], "w") as bf, open(paths["pitching"], "w") as pf:
+        bf.write(",".join(BATTING_HEADER) + "\n")
+        pf.write(",".join(PITCHING_HEADER) + "\n")
+        for year in years:
+            lg = "AL" if year >= 1901 else "NL"
+            stats = batting_lines(rng, len(clubs) * BATTERS_PER_CLUB)
+            rows = []
+            for i, (team, slot) in enumerate((t, s) for t in clubs
+                                             for s in range(BATTERS_PER_CLUB)):
+                cells = stats[i].tolist()
+                # Early seasons leave CS/IBB/HBP/SF blank, as Lahman does
+                blanks = {9, 12, 13, 15} if year < 1920 else ()
+                cells = ["" if j in blanks else str(v) for j, v in enumerate(cells)]
+                rows.append(f"{player_id(team, 'b', slot, year)},{year},1,{team},{lg},"
+                            + ",".join(cells))
+            bf.write("\n".join(rows) + "\n")
+
+            stats, baopp, era = pitching_lines(rng, len(clubs) * PITCHERS_PER_CLUB)
+            rows = []
+            for i, (team, slot) in enumerate((t, s) for t in clubs
+                                             for s in range(PITCHERS_PER_CLUB)):
+                cells = stats[i].tolist()
+                cells[13] = f"{baopp[i]:.3f}"
+                cells[14] = f"{era[i]:.2f}"
+                rows.append(f"{player_id(team, 'p', slot, year)},{year},1,{team},{lg},"
+                            + ",".join(map(str, cells)))
+            pf.write("\n".join(rows) + "\n")
+
+    write_source(paths["source"], clubs, years, rng)
+    write_rdata(paths["lahman"], clubs, years, rng, scale)
+    return paths
+
+
+def batting_lines(rng, n):
+    """n internally consistent batting lines, in BATTING_HEADER order from G:
+    H <= AB, extra-base hits <= H, IBB <= BB, CS <= SB and so on."""
+    import numpy as np
+
+    binomial = rng.binomial
+    g = rng.integers(1, 163, size=n)
+    ab = binomial(4 * g, 0.95)
+    h = binomial(ab, rng.uniform(0.18, 0.32, size=n))
+    doubles = binomial(h, 0.18)
+    triples = binomial(h - doubles, 0.03)
+    hr = binomial(h - doubles - triples, 0.12)
+    bb = binomial(ab, 0.09)
+    sb = binomial(h + bb, 0.07)
+    return np.column_stack([
+        g, ab, binomial(h + bb, 0.45), h, doubles, triples, hr,
+        binomial(h + hr, 0.5),                         # RBI
+        sb, binomial(sb, 0.3), bb, binomial(ab, 0.17),  # SB, CS, BB, SO
+        binomial(bb, 0.1), binomial(g, 0.03),           # IBB, HBP
+        binomial(g, 0.02), binomial(g, 0.03),           # SH, SF
+        binomial(ab - h, 0.02),                         # GIDP
+    ])
+
+
+def pitching_lines(rng, n):
+    """n internally consistent pitching lines, in PITCHING_HEADER order from
+    W (BAOpp and ERA columns zeroed), plus their BAOpp and ERA: GS <= G,
+    SO at most three per inning, ER <= R and ERA = 27 * ER / IPouts."""
+    import numpy as np
+
+    binomial = rng.binomial
+    g = rng.integers(1, 71, size=n)
+    gs = binomial(g, rng.choice([0.02, 0.9], size=n, p=[0.6, 0.4]))
+    relief = g - gs
+    cg = binomial(gs, 0.1)
+    ipouts = np.maximum(1, binomial(18 * gs + 4 * relief, 0.95))
+    h = binomial(ipouts, 0.3)
+    bb = binomial(ipouts, 0.1)
+    hbp = binomial(g, 0.1)
+    r = binomial(h + bb + hbp, 0.35)
+    er = binomial(r, 0.9)
+    w = binomial(g, 0.3)
+    gf = binomial(relief, 0.4)
+    sh = binomial(g, 0.05)
+    sf = binomial(g, 0.05)
+    bfp = ipouts + h + bb + hbp
+    zeros = np.zeros(n, dtype=int)
+    stats = np.column_stack([
+        w, binomial(g - w, 0.35), g, gs, cg, binomial(cg, 0.3),  # W, L, G, GS, CG, SHO
+        binomial(gf, 0.4), ipouts, h, er, binomial(h, 0.1), bb,  # SV, IPouts, H, ER, HR, BB
+        binomial(ipouts, 0.25), zeros, zeros,                    # SO, BAOpp, ERA
+        binomial(bb, 0.08), binomial(g, 0.1), hbp,               # IBB, WP, HBP
+        binomial(g, 0.02), bfp, gf, r, sh, sf,                   # BK, BFP, GF, R, SH, SF
+        binomial(h, 0.1),                                        # GIDP
+    ])
+    return stats, h / np.maximum(1, bfp - bb - hbp - sh - sf), 27 * er / ipouts
+
+
+def write_source(path, clubs, years, rng):
+    """core_rosters JSON: eight position players, five starters and a closer
+    per club-season, written one club at a time."""
+    with open(path, "w") as f:
+        f.write('{"teams":{')
+        for n, team in enumerate(clubs):
+            games = rng.integers(20, 162, size=(len(years), len(POSITIONS) + 6)).tolist()
+            outs = rng.integers(90, 700, size=(len(years), 6)).tolist()
+            team_years = {}
+            for i, year in enumerate(years):
+                starters = [{"playerID": player_id(team, "p", s, year),
+                             "name": f"Starter {team} {s}", "G": games[i][8 + s],
+                             "GS": games[i][8 + s] // 2, "IPouts": outs[i][s]}
+                            for s in range(5)]
+                team_years[str(year)] = {
+                    "position_players": {
+                        pos: {"playerID": player_id(team, "b", s, year),
+                              "name": f"{pos} {team} {s}", "G": games[i][s]}
+                        for s, pos in enumerate(POSITIONS)
+                    },
+                    "pitchers": {
+                        "starters": starters,
+                        "closer": {"playerID": player_id(team, "p", 5, year),
+                                   "name": f"Closer {team}", "G": games[i][13],
+                                   "SV": games[i][13] // 3, "IPouts": outs[i][5]},
+                    },
+                }
+            f.write(("," if n else "") + json.dumps(team) + ":"
+                    + json.dumps({"years": team_years}, separators=(",", ":")))
+        f.write("}}")
+
+
+def write_rdata(directory, clubs, years, rng, scale):
+    """HallOfFame, AwardsPlayers, AllstarFull and Teams at Lahman row counts
+    times scale, with the columns load_lahman_rdata() reads."""
+    import pandas as pd
+    import pyreadr
+
+    def sample_players(count):
+        teams = rng.choice(clubs, size=count)
+        roles = rng.choice(["b", "p"], size=count)
+        slots = rng.integers(0, 5, size=count)
+        years_ = rng.integers(FIRST_YEAR, LAST_YEAR + 1, size=count)
+        ids = [player_id(t, r, int(s), int(y)) for t, r, s, y in zip(teams, roles, slots, years_)]
+        return ids, years_.astype("int32"), teams
+
+    ids, yrs, _ = sample_players(6400 * scale)
+    hof = pd.DataFrame({
+        "playerID": ids, "yearID": yrs, "votedBy": "BBWAA",
+        "ballots": 400.0, "needed": 300.0, "votes": rng.integers(0, 400, len(ids)).astype(float),
+        "inducted": rng.choice(["Y", "N"], size=len(ids), p=[0.05, 0.95]),
+        "category": rng.choice(["Player", "Manager"], size=len(ids), p=[0.9, 0.1]),
+    })
+
+    ids, yrs, _ = sample_players(12700 * scale)
+    award_ids = list(ey.AWARD_MAP) + ["Baseball Magazine All-Star", "TSN All-Star"]
+    awards = pd.DataFrame({
+        "playerID": ids, "awardID": rng.choice(award_ids, size=len(ids)),
+        "yearID": yrs, "lgID": "AL", "tie": "", "notes": "",
+    })
+
+    ids, yrs, teams = sample_players(6400 * scale)
+    allstar = pd.DataFrame({
+        "playerID": ids, "yearID": yrs, "gameNum": 0, "gameID": "",
+        "teamID": teams, "lgID": "AL", "GP": 1, "startingPos": 0,
+    })
+
+    grid = [(year, team) for year in years for team in clubs]
+    wins = rng.integers(40, 110, size=len(grid))
+    ws = rng.random(len(grid))
+    teams_df = pd.DataFrame({
+        "yearID": [y for y, _ in grid], "lgID": "AL",
+        "teamID": [t for _, t in grid], "franchID": [t for _, t in grid],
+        "W": wins, "L": 154 - wins,
+        "LgWin": ["Y" if r < 0.1 else "N" for r in ws],
+        "WSWin": ["Y" if r < 0.05 else "N" for r in ws],
+        "name": [f"Club {t}" for _, t in grid],
+        # League totals for the OPS+/ERA+ baselines
+        **{col: rng.integers(lo, hi, size=len(grid)).astype(float)
+           for col, lo, hi in [("AB", 5000, 5600), ("H", 1200, 1600), ("X2B", 200, 320),
+                               ("X3B", 15, 60), ("HR", 60, 240), ("BB", 400, 650),
+                               ("HBP", 30, 90), ("SF", 30, 60), ("ER", 550, 800),
+                               ("IPouts", 4250, 4400)]},
+    })
+
+    for name, df in [("HallOfFame", hof), ("AwardsPlayers", awards),
+                     ("AllstarFull", allstar), ("Teams", teams_df)]:
+        pyreadr.write_rdata(os.path.join(directory, f"{name}.RData"), df, df_name=name)
+
+
+def ensure_inputs(scale):
+    """Generated inputs for scale, reused across runs until GENERATOR_VERSION
+    changes."""
+    directory = os.path.join(BENCH_DIR, f"v{GENERATOR_VERSION}-{scale}x")
+    done = os.path.join(directory, ".complete")
+    if not os.path.exists(done):
+        print(f"Generating {scale}x inputs in {directory}...")
+        os.makedirs(directory, exist_ok=True)
+        start = time.perf_counter()
+        generate(directory, scale)
+        open(done, "w").close()
+        print(f"  done in {time.perf_counter() - start:.1f}s")
+    return {
+        "source": os.path.join(directory, "core_rosters.json"),
+        "batting": os.path.join(directory, "Batting.csv"),
+        "pitching": os.path.join(directory, "Pitching.csv"),
+        "lahman": os.path.join(directory, "lahman"),
+    }
+
+
+# --- Measurement ---
+
+def measure(results, stage, fn, *args):
+    """Run fn(*args) as one named stage, recording seconds and peak RSS."""
+    ey.reset_peak_rss()
+    start = time.perf_counter()
+    value = fn(*args)
+    results[stage] = {
+        "seconds": round(time.perf_counter() - start, 4),
+        "peak_rss_mb": round(ey.peak_rss_mb(), 1),
+    }
+    return value
+
+
+def run_scale(scale, teams):
+    """Run every stage once on scale's inputs in this (fresh) process."""
+    print(f"\nRunning {scale}x...")
+    paths = ensure_inputs(scale)
+    ey.SOURCE = paths["source"]
+    ey.BATTING_CSV = paths["batting"]
+    ey.PITCHING_CSV = paths["pitching"]
+    ey.LAHMAN_DIR = paths["lahman"]
+    ey.CACHE_DIR = BENCH_CACHE_DIR
+
+    results = {}
+    with tempfile.TemporaryDirectory() as out:
+        sources = measure(results, "source", ey.load_source_teams, ey.SOURCE, teams)
+        teams = sorted(sources) if teams is None else teams
+        batting = measure(results, "batting", ey.load_batting_stats, tuple(teams))
+        pitching = measure(results, "pitching", ey.load_pitching_stats, tuple(teams))
+        lahman = measure(results, "lahman", ey.load_lahman_rdata)
+        measure(results, "derived", ey.derive_stats, batting, pitching, lahman)
+
+        configs = {team: ey.team_config(team, lahman) for team in teams}
+
+        def enrich():
+            return {team: ey.enrich_years(sources[team], batting.get(team, {}),
+                                          pitching.get(team, {}), lahman, configs[team])[0]
+                    for team in teams}
+
+        def leaderboards():
+            return {team: ey.build_leaderboards(years[team], lahman) for team in teams}
+
+        years = measure(results, "enrich", enrich)
+        boards = measure(results, "leaderboards", leaderboards)
+        outputs = {team: ey.assemble_output(team, years[team], boards[team], lahman,
+                                            configs[team])
+                   for team in teams}
+        # Each writer as write_output() runs it: fn(output, JSON path) -> bytes
+        for stage, fn in [
+            ("serialize", lambda output, path:
+                ey.write_json(path, ey.normalize_output(output))),
+            ("columnar", lambda output, path:
+                ey.write_columnar(ey.columnar_path(path), output["years"])),
+            ("search", lambda output, path:
+                ey.write_json(ey.search_index_path(path),
+                              ey.build_search_index(output["years"]))),
+            ("similar", lambda output, path:
+                ey.write_json(ey.similar_path(path), ey.build_similar(output["years"]))),
+            ("sqlite", lambda output, path:
+                ey.write_sqlite(ey.sqlite_path(path), output)),
+        ]:
+            measure(results, stage, lambda: sum(
+                fn(outputs[team], os.path.join(out, f"{team}.json")) for team in teams))
+    return results
+
+
+def run_inputs(scale, teams):
+    """Time the three loaders run concurrently, as process() runs them, in
+    a process of its own."""
+    paths = ensure_inputs(scale)
+    ey.BATTING_CSV = paths["batting"]
+    ey.PITCHING_CSV = paths["pitching"]
+    ey.LAHMAN_DIR = paths["lahman"]
+    ey.CACHE_DIR = BENCH_CACHE_DIR
+    if teams is None:
+        teams = sorted(ey.load_source_teams(paths["source"]))
+
+    results = {}
+    measure(results, "inputs", ey.load_inputs, teams, False)
+    return results
+
+
+# --- Baseline ---
+
+def compare(results, baseline):
+    """Return one message per stage that regressed past the tolerances."""
+    failures = []
+    for scale, stages in results.items():
+        for stage, now in stages.items():
+            then = baseline.get(scale, {}).get(stage)
+            if not then:
+                continue
+            slower = now["seconds"] - then["seconds"]
+            if slower > MIN_SECONDS and now["seconds"] > then["seconds"] * (1 + TIME_TOLERANCE):
+                failures.append(f"{scale} {stage}: {now['seconds']:.3f}s "
+                                f"vs baseline {then['seconds']:.3f}s")
+            if now["peak_rss_mb"] > then["peak_rss_mb"] * (1 + MEMORY_TOLERANCE):
+                failures.append(f"{scale} {stage}: {now['peak_rss_mb']:.0f} MB "
+                                f"vs baseline {then['peak_rss_mb']:.0f} MB")
+    return failures
+
+
+def print_table(results, baseline):
+    print(f"\n{'scale':>6} {'stage':<13} {'seconds':>9} {'base':>9} {'peak MB':>9} {'base':>9}")
+    for scale, stages in results.items():
+        for stage in STAGES:
+            now = stages[stage]
+            then = baseline.get(scale, {}).get(stage, {})
+            base_s = f"{then['seconds']:.3f}" if then else "-"
+            base_mb = f"{then['peak_rss_mb']:.0f}" if then else "-"
+            print(f"{scale:>6} {stage:<13} {now['seconds']:>9.3f} {base_s:>9} "
+                  f"{now['peak_rss_mb']:>9.0f} {base_mb:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scales", default=",".join(map(str, SCALES)),
+                        help="comma-separated input multiples (default: 1,10,100)")
+    parser.add_argument("--teams", default=ey.HOME_TEAM,
+                        help=f"comma-separated teamIDs to build, or 'all' (default: {ey.HOME_TEAM})")
+    parser.add_argument("--repeat", type=int, default=REPEAT,
+                        help=f"runs per scale, keeping the best of each stage (default: {REPEAT})")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help=f"record these results in {os.path.basename(BASELINE)}")
+    parser.add_argument("--output", help="also write the results JSON here")
+    args = parser.parse_args()
+    scales = [int(s) for s in args.scales.split(",")]
+    teams = None if args.teams == "all" else [t.strip() for t in args.teams.split(",")]
+
+    # Every run gets a fresh process so one run's heap never inflates the
+    # next run's peak memory
+    results = {}
+    for scale in scales:
+        ensure_inputs(scale)
+        runs = []
+        for _ in range(args.repeat):
+            run = {}
+            for fn in (run_scale, run_inputs):
+                with ProcessPoolExecutor(max_workers=1) as pool:
+                    run.update(pool.submit(fn, scale, teams).result())
+            runs.append(run)
+        results[f"{scale}x"] = {
+            stage: {key: min(run[stage][key] for run in runs)
+                    for key in ("seconds", "peak_rss_mb")}
+            for stage in STAGES
+        }
+
+    report = {
+        "machine": f"{platform.system()} {platform.machine()}, {os.cpu_count()} CPU, "
+                   f"Python {platform.python_version()}",
+        "teams": args.teams,
+        "results": results,
+    }
+
+    # Timings only mean something on the machine that recorded them: any
+    # other run shows the baseline for reference but can't fail on it
+    baseline, reference = {}, {}
+    if os.path.exists(BASELINE):
+        with open(BASELINE) as f:
+            stored = json.load(f)
+        if stored["teams"] != report["teams"]:
+            print(f"\nBaseline was recorded for {stored['teams']}; "
+                  f"not comparing (re-record with --update-baseline)")
+        elif stored["machine"] != report["machine"]:
+            reference = stored["results"]
+            print(f"\nBaseline was recorded on {stored['machine']}; shown for reference "
+                  f"only (re-record with --update-baseline to compare on this machine)")
+        else:
+            baseline = reference = stored["results"]
+    print_table(results, reference)
+    if args.output:
+        ey.write_json(os.path.abspath(args.output), report)
+
+    if args.update_baseline:
+        report["results"] = {**baseline, **results}
+        ey.write_json(BASELINE, report)
+        print(f"\nWrote {BASELINE}")
+        return
+
+    if not baseline:
+        return
+    failures = compare(results, baseline)
+    if failures:
+        print("\nRegressions against baseline:")
+        for line in failures:
+            print(f"  {line}")
+        sys.exit(1)
+    print("\nNo regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
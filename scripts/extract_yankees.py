@@ -3,12 +3,34 @@
 full batting/pitching stats from Lahman CSVs, plus HOF, awards, retired
 numbers, nicknames, and historical moments."""
 
-import csv
+import argparse
+import array
+import contextlib
+import cProfile
+import functools
+import gzip
+import hashlib
+import heapq
+import io
 import json
+import math
+import mmap
 import os
+import pickle
+import pstats
+import re
+import resource
+import sqlite3
+import struct
+import sys
+import tarfile
+import tempfile
+import threading
+import time
+import unicodedata
+import zipfile
 from collections import defaultdict
-
-import pyreadr
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 SCRIPT_DIR = os.path.dirname(__file__)
 DATA_DIR = os.path.join(SCRIPT_DIR, "..", "data")
@@ -16,8 +38,39 @@ SOURCE = os.path.join(DATA_DIR, "core_rosters_1900_2025.json")
 BATTING_CSV = os.path.join(SCRIPT_DIR, "Batting.csv")
 PITCHING_CSV = os.path.join(SCRIPT_DIR, "Pitching.csv")
 OUTPUT = os.path.join(DATA_DIR, "yankees.json")
+TEAMS_OUTPUT_DIR = os.path.join(DATA_DIR, "teams")
+
+# The site's own club: built by default and written to OUTPUT; any other
+# franchise goes to TEAMS_OUTPUT_DIR/<teamID>.json
+HOME_TEAM = "NYA"
+
+# Written by every build as the client's entry point: each team's layout
+# ("shards" or "single") and, with --publish, its content-hashed copies
+# with .gz/.br siblings (logical path under DATA_DIR -> hashed path)
+ASSET_MANIFEST = os.path.join(DATA_DIR, "asset-manifest.json")
+PUBLISH_KEEP = 2  # hashed generations kept per asset so open sessions can finish
 
 LAHMAN_DIR = os.path.join(DATA_DIR, "lahman")
+LAHMAN_TABLES = ["HallOfFame", "AwardsPlayers", "AllstarFull", "Teams"]
+
+# --archive: zip or tar(.gz/.bz2/.xz) files to read the Lahman inputs from
+# instead (see archive_member)
+ARCHIVES = []
+
+# Parsed intermediates are pickled here, keyed on the content hash of their
+# inputs, CACHE_VERSION and the tables the loaders read (LOADER_CONFIG), so
+# editing AWARD_MAP never reuses an entry parsed under the old rules while
+# editing NICKNAMES or ON_THIS_DATE keeps every entry.  Bump CACHE_VERSION
+# whenever a loader's parsing or the shape of what it returns changes.
+CACHE_DIR = os.path.join(SCRIPT_DIR, ".cache")
+CACHE_KEEP = 3  # entries kept per stage, least recently used evicted first
+CACHE_VERSION = 2
+LOADER_CONFIG = ("AWARD_MAP", "BATTING_COLUMNS", "PITCHING_COLUMNS", "COLUMN_ALIASES",
+                 "LAHMAN_TABLES")
+
+# --profile: build-profile.json and any cProfile dumps, kept out of the
+# served DATA_DIR
+PROFILE_DIR = os.path.join(CACHE_DIR, "profile")
 
 # All 27 World Series wins
 WS_WON = {
@@ -167,6 +220,22 @@ AWARD_MAP = {
     "Rookie of the Year": "ROY",
 }
 
+# Per-franchise presentation config.  Clubs not listed here still build in
+# multi-team mode: name and World Series results come from Teams.RData and
+# the hand-curated tables are simply empty.
+TEAMS = {
+    "NYA": {
+        "teamName": "New York Yankees",
+        "wsWon": WS_WON,
+        "wsLost": WS_LOST,
+        "eras": ERAS,
+        "eraQuotes": ERA_QUOTES,
+        "retiredNumbers": RETIRED_NUMBERS,
+        "nicknames": NICKNAMES,
+        "onThisDate": ON_THIS_DATE,
+    },
+}
+
 
 def parse_int(val):
     if not val or not str(val).strip():
@@ -186,6 +255,157 @@ def parse_float(val):
         return None
 
 
+# Streaming reader for the roster source: only the requested team's subtree is
+# materialized, every other franchise is skipped byte-for-byte.
+JSON_SKIP_RUN = re.compile(r'(?:[^"{}\[\]]+|"[^"\\]*(?:\\.[^"\\]*)*")*', re.DOTALL)
+JSON_STRING_END = re.compile(r'["\\]')
+JSON_SCALAR_END = re.compile(r'[,}\]\s]')
+
+
+class JsonStream:
+    """Forward-only scanner over a JSON text file read in fixed-size chunks."""
+
+    def __init__(self, f, chunk_size=1 << 16):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.parts = None  # text captured so far by read_value
+        self.mark = 0
+
+    def _more(self):
+        if self.parts is not None:
+            self.parts.append(self.buf[self.mark:])
+            self.mark = 0
+        self.buf = self.f.read(self.chunk_size)
+        self.pos = 0
+        if not self.buf:
+            raise ValueError("unexpected end of JSON input")
+
+    def peek(self):
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            self._more()
+
+    def expect(self, ch):
+        found = self.peek()
+        if found != ch:
+            raise ValueError(f"expected {ch!r} in JSON input, found {found!r}")
+        self.pos += 1
+
+    def _skip_string(self):
+        # Called just past the opening quote
+        while True:
+            m = JSON_STRING_END.search(self.buf, self.pos)
+            if not m:
+                self.pos = len(self.buf)
+                self._more()
+                continue
+            self.pos = m.end()
+            if m.group() == '"':
+                return
+            if self.pos >= len(self.buf):
+                self._more()
+            self.pos += 1  # escaped character
+
+    def skip_value(self):
+        """Consume one value without building it."""
+        ch = self.peek()
+        if ch == '"':
+            self.pos += 1
+            self._skip_string()
+            return
+        if ch not in "{[":
+            while True:
+                m = JSON_SCALAR_END.search(self.buf, self.pos)
+                if m:
+                    self.pos = m.start()
+                    return
+                self.pos = len(self.buf)
+                self._more()
+
+        # Each match swallows plain text and complete strings in one go; a
+        # quote left over means a string runs past the end of the buffer.
+        depth = 0
+        while True:
+            self.pos = JSON_SKIP_RUN.match(self.buf, self.pos).end()
+            if self.pos >= len(self.buf):
+                self._more()
+                continue
+            ch = self.buf[self.pos]
+            self.pos += 1
+            if ch == '"':
+                self._skip_string()
+            elif ch in "{[":
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def read_value(self):
+        """Consume one value and decode it."""
+        self.peek()
+        self.parts = []
+        self.mark = self.pos
+        try:
+            self.skip_value()
+            self.parts.append(self.buf[self.mark:self.pos])
+            text = "".join(self.parts)
+        finally:
+            self.parts = None
+        return json.loads(text)
+
+    def members(self):
+        """Yield each key of the object at the current position.  The caller
+        must consume the matching value (read_value or skip_value) before
+        asking for the next key."""
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.read_value()
+            self.expect(":")
+            yield key
+            ch = self.peek()
+            self.pos += 1
+            if ch == "}":
+                return
+            if ch != ",":
+                raise ValueError(f"expected ',' or '}}' in JSON input, found {ch!r}")
+
+
+def load_source_teams(path, teams=None):
+    """Return {teamID: data["teams"][teamID]} for the requested teams (all
+    when None) in one pass over the roster source, without decoding the
+    franchises that were not asked for."""
+    wanted = None if teams is None else set(teams)
+    found = {}
+    with open(path, encoding="utf-8") as f:
+        stream = JsonStream(f)
+        for key in stream.members():
+            if key != "teams":
+                stream.skip_value()
+                continue
+            for team_id in stream.members():
+                if wanted is None or team_id in wanted:
+                    found[team_id] = stream.read_value()
+                else:
+                    stream.skip_value()
+            break
+
+    missing = wanted - found.keys() if wanted is not None else set()
+    if missing:
+        raise KeyError(f"teams {sorted(missing)} not found in {path}")
+    PROFILER.note(rows_out=sum(len(t.get("years", {})) for t in found.values()))
+    return found
+
+
 def ipouts_to_ip(ipouts):
     """Convert IPouts (total outs recorded) to familiar IP format like '66.1'."""
     full_innings = ipouts // 3
@@ -193,144 +413,962 @@ def ipouts_to_ip(ipouts):
     return f"{full_innings}.{remainder}"
 
 
-def load_batting_stats():
-    """Load Batting.csv and index by (playerID, yearID, teamID).
-    Aggregates across stints for same team-year."""
+# Stat columns summed across stints, in the order the enrichment loop expects
+BATTING_COLUMNS = ["G", "AB", "H", "HR", "RBI", "R", "BB", "SB", "2B", "3B", "SO", "HBP",
+                   "SF", "IBB"]
+PITCHING_COLUMNS = ["W", "L", "G", "GS", "SV", "IPouts", "SO", "BB", "ER", "H",
+                    "HR", "CG", "SHO"]
+
+# Older Lahman releases prefix the doubles/triples columns with an X
+COLUMN_ALIASES = {"2B": "X2B", "3B": "X3B"}
+
+
+class StatTable:
+    """One team's player-season stats: a (playerID, yearID) -> row index
+    plus one array('q') column per stat, instead of a dict per entry.
+    get() returns a StatRow, which reads like the old per-entry dict."""
+
+    __slots__ = ("columns", "index", "keys", "data")
+
+    def __init__(self, columns):
+        self.columns = tuple(columns)
+        self.index = {}
+        self.keys = []
+        self.data = {col: array.array("q") for col in self.columns}
+
+    def append(self, key, values):
+        self.index[key] = len(self.keys)
+        self.keys.append(key)
+        for col, value in zip(self.columns, values):
+            self.data[col].append(value)
+
+    def get(self, key, default=None):
+        row = self.index.get(key)
+        return default if row is None else StatRow(self, row)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def column(self, col):
+        """A loaded column as an int64 NumPy array (a view, not a copy)."""
+        import numpy as np
+
+        return np.frombuffer(self.data[col], dtype=np.int64)
+
+    def years(self):
+        """yearID of every row as an int64 NumPy array."""
+        import numpy as np
+
+        return np.array([year for _, year in self.keys], dtype=str).astype(np.int64)
+
+    def add_column(self, col, values):
+        """Store a computed float64 array as a read-only column."""
+        self.data[col] = array.array("d", values.astype("float64").tobytes())
+
+    def by_year(self):
+        """{yearID: [(playerID, StatRow), ...]} in load order."""
+        years = defaultdict(list)
+        for row, (pid, year) in enumerate(self.keys):
+            years[year].append((pid, StatRow(self, row)))
+        return years
+
+
+class StatRow:
+    """Read-only view of one StatTable row: row["HR"], row.get("SF", 0)."""
+
+    __slots__ = ("table", "row")
+
+    def __init__(self, table, row):
+        self.table = table
+        self.row = row
+
+    def __getitem__(self, col):
+        return self.table.data[col][self.row]
+
+    def get(self, col, default=None):
+        column = self.table.data.get(col)
+        return default if column is None else column[self.row]
+
+    def values(self):
+        """Every column's value, loaded and derived, in column order."""
+        return tuple(column[self.row] for column in self.table.data.values())
+
+
+# Lahman inputs are named by their loose-file paths (BATTING_CSV,
+# LAHMAN_DIR/<table>.RData) everywhere; these resolve a path to a member of
+# one of ARCHIVES when there is one, matched by file name at any depth, so
+# a distribution archive is read as-is.  Only the members a build reads are
+# decompressed, and into memory: a zip member directly, a tar archive's in
+# the one streaming pass that indexes it (a compressed tar can't seek).
+def file_signature(path):
+    """(mtime, size) of path, or None while it is missing."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def input_names():
+    """File names of every input a build may read from an archive."""
+    tables = LAHMAN_TABLES + ["People"]
+    return ({os.path.basename(BATTING_CSV), os.path.basename(PITCHING_CSV)}
+            | {f"{name}.RData" for name in tables})
+
+
+@functools.lru_cache(maxsize=2)
+def tar_contents(archive, signature):
+    """({file name: member name}, {member name: bytes}) from one pass over
+    a tar archive, first member wins, keeping the bytes of the members
+    named by input_names().  Forked RData workers inherit the memo."""
+    index, data = {}, {}
+    wanted = input_names()
+    with tarfile.open(archive, "r|*") as tf:
+        for info in tf:
+            name = info.name.rsplit("/", 1)[-1]
+            if not info.isfile() or name in index:
+                continue
+            index[name] = info.name
+            if name in wanted:
+                data[info.name] = tf.extractfile(info).read()
+    return index, data
+
+
+@functools.lru_cache(maxsize=16)
+def archive_index(archive, signature):
+    """{file name: member name} over an archive's regular files, first
+    member wins.  signature keys the memo to the archive's current
+    version."""
+    if not zipfile.is_zipfile(archive):
+        return tar_contents(archive, signature)[0]
+    with zipfile.ZipFile(archive) as zf:
+        names = [info.filename for info in zf.infolist() if not info.is_dir()]
+    index = {}
+    for name in names:
+        index.setdefault(name.rsplit("/", 1)[-1], name)
+    return index
+
+
+def archive_member(path):
+    """(archive, member name) to read the input at path from, or None to
+    use the file itself."""
+    name = os.path.basename(path)
+    for archive in ARCHIVES:
+        member = archive_index(archive, file_signature(archive)).get(name)
+        if member is not None:
+            return archive, member
+    return None
+
+
+def read_member(archive, member):
+    """One archive member's bytes: a zip's decompressing nothing else, a
+    tar's from tar_contents()."""
+    if zipfile.is_zipfile(archive):
+        with zipfile.ZipFile(archive) as zf:
+            return zf.read(member)
+    data = tar_contents(archive, file_signature(archive))[1].get(member)
+    if data is None:
+        with tarfile.open(archive, "r:*") as tf:
+            data = tf.extractfile(member).read()
+    return data
+
+
+def input_exists(path):
+    return archive_member(path) is not None or os.path.exists(path)
+
+
+def input_digest(path):
+    """Content digest of an input for cache keys: the file's, or for an
+    archive member the archive's plus the member name."""
+    found = archive_member(path)
+    if found is None:
+        return file_digest(path)
+    archive, member = found
+    return f"{archive_digest(archive, file_signature(archive))}:{member}"
+
+
+@functools.lru_cache(maxsize=16)
+def archive_digest(archive, signature):
+    return file_digest(archive)
+
+
+def input_signature(path):
+    """file_signature() of what holds the input: its archive or the file."""
+    found = archive_member(path)
+    return file_signature(found[0] if found else path)
+
+
+@contextlib.contextmanager
+def open_input(path):
+    """The input at path as a read-only buffer: the file memory-mapped, or
+    its archive member's bytes."""
+    found = archive_member(path)
+    if found is not None:
+        yield read_member(*found)
+        return
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            yield buf
+
+
+@contextlib.contextmanager
+def input_path(path):
+    """A filesystem path with the input's contents, for readers that only
+    take a path (pyreadr): the file itself, or for an archive member an
+    in-memory file (memfd, Linux) holding it.  Where there is no memfd the
+    member goes to a temporary directory, removed on exit."""
+    found = archive_member(path)
+    if found is None:
+        yield path
+        return
+    data = read_member(*found)
+    if hasattr(os, "memfd_create"):
+        fd = os.memfd_create(os.path.basename(path))
+        try:
+            with open(fd, "wb", closefd=False) as f:
+                f.write(data)
+            yield f"/proc/self/fd/{fd}"
+        finally:
+            os.close(fd)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            copy = os.path.join(tmp, os.path.basename(path))
+            with open(copy, "wb") as f:
+                f.write(data)
+            yield copy
+
+
+def team_field(buf):
+    """(index of the teamID field, offset of the first data line) in a mapped
+    CSV, or None when its rows can't be split on bare commas: no teamID
+    column, or a quoted header.  Quotes in data lines are caught among the
+    lines select_team_lines() keeps."""
+    header_end = buf.find(b"\n") + 1
+    if header_end == 0 or b'"' in buf[:header_end]:
+        return None
+    fields = [f.strip() for f in buf[:header_end].decode("utf-8-sig").split(",")]
+    if "teamID" not in fields:
+        return None
+    return fields.index("teamID"), header_end
+
+
+def count_lines(buf, start, chunk=1 << 20):
+    """Lines in buf from offset start, counted a chunk at a time so a large
+    map is never copied whole."""
+    count = sum(buf[i:i + chunk].count(b"\n") for i in range(start, len(buf), chunk))
+    return count + (len(buf) > start and buf[-1:] != b"\n")
+
+
+def release_pages(buf, start, end):
+    """Let the kernel drop a scanned range of a mapped file from this
+    process's resident set (a no-op for in-memory bytes)."""
+    if isinstance(buf, mmap.mmap) and hasattr(mmap, "MADV_DONTNEED"):
+        start -= start % mmap.PAGESIZE
+        buf.madvise(mmap.MADV_DONTNEED, start, min(end, len(buf)) - start)
+
+
+def select_team_lines(path, teams, chunk=1 << 26):
+    """Header plus the data lines of teams from a Lahman CSV, as bytes for
+    the CSV parser, or None to parse the whole file.
+
+    The file is memory-mapped (an archive member read into memory) and
+    searched for the teams' codes a chunk at a time, releasing each chunk
+    once scanned, so only the lines they occur in (about 3% for one club)
+    are split and only the kept rows are ever decoded.  A quote in any of
+    those lines means its fields may not split on bare commas, and the
+    whole file is parsed instead.  The data lines scanned are the profile
+    stage's rows_in."""
+    with open_input(path) as buf:
+        layout = team_field(buf)
+        if layout is None:
+            return None
+        field, start = layout
+        if PROFILER.enabled:
+            PROFILER.note(rows_in=count_lines(buf, start))
+
+        codes = {t.encode("utf-8") for t in teams}
+        spans = set()
+        for code in codes:
+            pos = start
+            for chunk_end in range(start + chunk, len(buf) + chunk, chunk):
+                while True:
+                    pos = buf.find(code, pos, chunk_end + len(code) - 1)
+                    if pos < 0:
+                        break
+                    line_start = buf.rfind(b"\n", start, pos) + 1 or start
+                    pos = buf.find(b"\n", pos) + 1 or len(buf)
+                    spans.add((line_start, pos))
+                pos = max(pos, chunk_end)
+                release_pages(buf, chunk_end - chunk, chunk_end)
+
+        lines = []
+        for line_start, line_end in sorted(spans):
+            line = buf[line_start:line_end]
+            if b'"' in line:
+                return None
+            fields = line.split(b",", field + 1)
+            if len(fields) > field and fields[field].strip() in codes:
+                lines.append(line)
+        if lines and not lines[-1].endswith(b"\n"):
+            lines[-1] += b"\n"
+        return buf[:start] + b"".join(lines)
+
+
+def load_team_stats(path, columns, teams=("NYA",)):
+    """Read only the key and stat columns of a Lahman CSV, keep the requested
+    teams' rows (all when None), and sum stints per (teamID, playerID, yearID)
+    in a single group-by.  For a list of teams only their lines reach the
+    parser (see select_team_lines).
+
+    Returns {teamID: StatTable} keyed by (playerID, yearID) with yearID as
+    a string, matching the per-row parse (blanks and junk count as 0, floats
+    truncate)."""
+    # Imported here so a warm build cache never pays for pandas
+    import numpy as np
+    import pandas as pd
+
+    selected = None if teams is None else select_team_lines(path, teams)
+    prefiltered = selected is not None
+    if selected is None and archive_member(path) is not None:
+        with open_input(path) as buf:
+            selected = buf
+    if selected is not None:
+        path = io.BytesIO(selected)
+
+    header = [c.strip() for c in pd.read_csv(path, nrows=0).columns]
+    if selected is not None:
+        path.seek(0)
+    source = {}
+    for col in columns:
+        if col in header:
+            source[col] = col
+        elif COLUMN_ALIASES.get(col) in header:
+            source[col] = COLUMN_ALIASES[col]
+
+    keys = ["playerID", "yearID", "teamID"]
+    df = pd.read_csv(
+        path,
+        usecols=lambda c: c.strip() in keys or c.strip() in source.values(),
+        dtype=str,
+        keep_default_na=False,
+        encoding="utf-8",
+    )
+    df.columns = [c.strip() for c in df.columns]
+    if not prefiltered:
+        PROFILER.note(rows_in=len(df))
+    for key in keys:
+        df[key] = df[key].str.strip() if key in df else ""
+
+    keep = (df["playerID"] != "") & (df["yearID"] != "") & (df["teamID"] != "")
+    if teams is not None:
+        keep &= df["teamID"].isin(list(teams))
+    df = df[keep]
+    PROFILER.note(rows_kept=len(df))
+
+    # Typed int64 columns; anything unparseable becomes 0 like parse_int
+    values = pd.DataFrame(index=df.index)
+    for col in columns:
+        if col in source:
+            raw = pd.to_numeric(df[source[col]].str.strip(), errors="coerce")
+            values[col] = np.trunc(raw.fillna(0)).astype(np.int64)
+        else:
+            values[col] = np.zeros(len(df), dtype=np.int64)
+
+    grouped = values.groupby([df["teamID"], df["playerID"], df["yearID"]], sort=False).sum()
     stats = {}
-    if not os.path.exists(BATTING_CSV):
+    for (team, pid, year), row in zip(grouped.index.tolist(), grouped.to_numpy().tolist()):
+        table = stats.get(team)
+        if table is None:
+            table = stats[team] = StatTable(columns)
+        table.append((pid, year), row)
+    return stats
+
+
+def describe_teams(teams):
+    """Label for log lines: 'NYA' for one team, 'all-team' for None."""
+    if teams is None:
+        return "all-team"
+    return "/".join(teams)
+
+
+def load_people():
+    """playerID -> "First Last" from People.RData, for players who never
+    started and so have no name in the roster source."""
+    names = {}
+    try:
+        df = read_rdata_table("People")
+        first = df["nameFirst"].fillna("").astype(str).str.strip()
+        last = df["nameLast"].fillna("").astype(str).str.strip()
+        full = (first + " " + last).str.strip()
+        names = {pid: name for pid, name in zip(df["playerID"].tolist(), full.tolist()) if name}
+        PROFILER.note(rows_out=len(names))
+        print(f"  Loaded {len(names)} player names from People.RData")
+    except Exception as e:
+        print(f"  Warning: Could not load People.RData, bench players keep their IDs: {e}")
+    return names
+
+
+def load_batting_stats(teams=("NYA",)):
+    """Load Batting.csv and index by teamID, then (playerID, yearID).
+    Aggregates across stints for same team-year."""
+    if not input_exists(BATTING_CSV):
         print(f"  Warning: {BATTING_CSV} not found, skipping batting enrichment")
-        return stats
-
-    with open(BATTING_CSV, newline="", encoding="utf-8") as f:
-        for row in csv.DictReader(f):
-            pid = row.get("playerID", "").strip()
-            year = row.get("yearID", "").strip()
-            team = row.get("teamID", "").strip()
-            if not pid or not year or team != "NYA":
-                continue
+        return {}
 
-            key = (pid, year)
-            if key not in stats:
-                stats[key] = {"G": 0, "AB": 0, "H": 0, "HR": 0, "RBI": 0,
-                              "R": 0, "BB": 0, "SB": 0, "2B": 0, "3B": 0, "SO": 0}
-
-            s = stats[key]
-            s["G"] += parse_int(row.get("G"))
-            s["AB"] += parse_int(row.get("AB"))
-            s["H"] += parse_int(row.get("H"))
-            s["HR"] += parse_int(row.get("HR"))
-            s["RBI"] += parse_int(row.get("RBI"))
-            s["R"] += parse_int(row.get("R"))
-            s["BB"] += parse_int(row.get("BB"))
-            s["SB"] += parse_int(row.get("SB"))
-            s["2B"] += parse_int(row.get("2B") or row.get("X2B"))
-            s["3B"] += parse_int(row.get("3B") or row.get("X3B"))
-            s["SO"] += parse_int(row.get("SO"))
-
-    print(f"  Loaded {len(stats)} NYA batter-seasons from Batting.csv")
+    stats = load_team_stats(BATTING_CSV, BATTING_COLUMNS, teams)
+    count = sum(len(s) for s in stats.values())
+    PROFILER.note(rows_out=count)
+    print(f"  Loaded {count} {describe_teams(teams)} batter-seasons from Batting.csv")
     return stats
 
 
-def load_pitching_stats():
-    """Load Pitching.csv and index by (playerID, yearID) for NYA.
+def load_pitching_stats(teams=("NYA",)):
+    """Load Pitching.csv and index by teamID, then (playerID, yearID).
     Aggregates across stints."""
-    stats = {}
-    if not os.path.exists(PITCHING_CSV):
+    if not input_exists(PITCHING_CSV):
         print(f"  Warning: {PITCHING_CSV} not found, skipping pitching enrichment")
-        return stats
-
-    with open(PITCHING_CSV, newline="", encoding="utf-8") as f:
-        for row in csv.DictReader(f):
-            pid = row.get("playerID", "").strip()
-            year = row.get("yearID", "").strip()
-            team = row.get("teamID", "").strip()
-            if not pid or not year or team != "NYA":
-                continue
+        return {}
 
-            key = (pid, year)
-            if key not in stats:
-                stats[key] = {"W": 0, "L": 0, "G": 0, "GS": 0, "SV": 0,
-                              "IPouts": 0, "SO": 0, "BB": 0, "ER": 0, "H": 0,
-                              "HR": 0, "CG": 0, "SHO": 0}
-
-            s = stats[key]
-            s["W"] += parse_int(row.get("W"))
-            s["L"] += parse_int(row.get("L"))
-            s["G"] += parse_int(row.get("G"))
-            s["GS"] += parse_int(row.get("GS"))
-            s["SV"] += parse_int(row.get("SV"))
-            s["IPouts"] += parse_int(row.get("IPouts"))
-            s["SO"] += parse_int(row.get("SO"))
-            s["BB"] += parse_int(row.get("BB"))
-            s["ER"] += parse_int(row.get("ER"))
-            s["H"] += parse_int(row.get("H"))
-            s["HR"] += parse_int(row.get("HR"))
-            s["CG"] += parse_int(row.get("CG"))
-            s["SHO"] += parse_int(row.get("SHO"))
-
-    print(f"  Loaded {len(stats)} NYA pitcher-seasons from Pitching.csv")
+    stats = load_team_stats(PITCHING_CSV, PITCHING_COLUMNS, teams)
+    count = sum(len(s) for s in stats.values())
+    PROFILER.note(rows_out=count)
+    print(f"  Loaded {count} {describe_teams(teams)} pitcher-seasons from Pitching.csv")
     return stats
 
 
+def read_rdata_table(name):
+    """First data frame in LAHMAN_DIR/<name>.RData."""
+    import pyreadr
+
+    with input_path(os.path.join(LAHMAN_DIR, f"{name}.RData")) as path:
+        data = pyreadr.read_r(path)
+    df = list(data.values())[0]
+    PROFILER.note(rows_in=len(df))
+    return df
+
+
+def load_hall_of_fame():
+    """Hall of Fame — set of inducted playerIDs."""
+    hof_set = set()
+    with PROFILER.stage("rdata:HallOfFame"):
+        try:
+            df = read_rdata_table("HallOfFame")
+            inducted = df[(df["inducted"] == "Y") & (df["category"] == "Player")]
+            hof_set = set(inducted["playerID"].unique())
+            PROFILER.note(rows_out=len(hof_set))
+            print(f"  Loaded {len(hof_set)} HOF inductees from HallOfFame.RData")
+        except Exception as e:
+            print(f"  Warning: Could not load HallOfFame.RData: {e}")
+    return {"hof": hof_set}
+
+
+def load_awards():
+    """Awards — {(playerID, yearID): [award_codes]}."""
+    awards_by_py = defaultdict(list)
+    with PROFILER.stage("rdata:AwardsPlayers"):
+        try:
+            df = read_rdata_table("AwardsPlayers")
+            df = df.assign(code=df["awardID"].map(AWARD_MAP))
+            df = df[df["code"].notna()].drop_duplicates(["playerID", "yearID", "code"])
+            for pid, year, code in zip(df["playerID"].tolist(),
+                                       df["yearID"].astype(int).tolist(),
+                                       df["code"].tolist()):
+                awards_by_py[(pid, year)].append(code)
+            PROFILER.note(rows_out=len(awards_by_py))
+            print(f"  Loaded {len(awards_by_py)} player-year award entries")
+        except Exception as e:
+            print(f"  Warning: Could not load AwardsPlayers.RData: {e}")
+    return {"awards": dict(awards_by_py)}
+
+
+def load_allstar():
+    """All-Star — {(playerID, yearID)} set."""
+    allstar_set = set()
+    with PROFILER.stage("rdata:AllstarFull"):
+        try:
+            df = read_rdata_table("AllstarFull").drop_duplicates(["playerID", "yearID"])
+            allstar_set = set(zip(df["playerID"].tolist(), df["yearID"].astype(int).tolist()))
+            PROFILER.note(rows_out=len(allstar_set))
+            print(f"  Loaded {len(allstar_set)} All-Star appearances")
+        except Exception as e:
+            print(f"  Warning: Could not load AllstarFull.RData: {e}")
+    return {"allstar": allstar_set}
+
+
+def league_baselines(df):
+    """{teamID: {yearID: (lgOBP, lgSLG, lgERA)}} from Teams rows: each
+    club-season's league totals, summed per (yearID, lgID) in one groupby.
+    HBP and SF are blank before they were recorded and count as 0."""
+    df = df.rename(columns={alias: col for col, alias in COLUMN_ALIASES.items()})
+    counts = ["AB", "H", "2B", "3B", "HR", "BB", "HBP", "SF", "ER", "IPouts"]
+    totals = df[counts].fillna(0).astype("float64").groupby([df["yearID"], df["lgID"]]).transform("sum")
+    on_base = totals["H"] + totals["BB"] + totals["HBP"]
+    obp = on_base / (totals["AB"] + totals["BB"] + totals["HBP"] + totals["SF"])
+    slg = (totals["H"] + totals["2B"] + 2 * totals["3B"] + 3 * totals["HR"]) / totals["AB"]
+    era = 27 * totals["ER"] / totals["IPouts"]
+
+    baselines = defaultdict(dict)
+    for team, year, row in zip(df["teamID"].astype(str).tolist(),
+                               df["yearID"].astype(int).tolist(),
+                               zip(obp.tolist(), slg.tolist(), era.tolist())):
+        baselines[team][year] = row
+    return dict(baselines)
+
+
+def load_team_records():
+    """Teams — {teamID: {yearID: {"W": w, "L": l}}} plus each club's latest
+    name and World Series results, for every team in one pass, and the
+    league baselines for OPS+ and ERA+."""
+    team_records = defaultdict(dict)
+    franchises = {}
+    baselines = {}
+    with PROFILER.stage("rdata:Teams"):
+        try:
+            df = read_rdata_table("Teams").sort_values("yearID", kind="stable")
+            for team, year, w, l, name, ws_win, lg_win in zip(
+                    df["teamID"].astype(str).tolist(),
+                    df["yearID"].astype(int).tolist(),
+                    df["W"].astype(int).tolist(),
+                    df["L"].astype(int).tolist(),
+                    df["name"].tolist(),
+                    df["WSWin"].tolist(),
+                    df["LgWin"].tolist()):
+                team_records[team][year] = {"W": w, "L": l}
+                info = franchises.setdefault(team, {"name": team, "wsWon": [], "wsLost": []})
+                if isinstance(name, str):
+                    info["name"] = name
+                if ws_win == "Y":
+                    info["wsWon"].append(year)
+                elif ws_win == "N" and lg_win == "Y":
+                    info["wsLost"].append(year)
+            PROFILER.note(rows_out=sum(len(r) for r in team_records.values()))
+            print(f"  Loaded {sum(len(r) for r in team_records.values())} season records "
+                  f"for {len(team_records)} teams from Teams.RData")
+        except Exception as e:
+            print(f"  Warning: Could not load Teams.RData: {e}")
+        else:
+            try:
+                baselines = league_baselines(df)
+            except Exception as e:
+                print(f"  Warning: No league baselines in Teams.RData, skipping OPS+/ERA+: {e}")
+    return {"records": dict(team_records), "franchises": franchises, "baselines": baselines}
+
+
+# One loader per LAHMAN_TABLES entry, each returning its slice of the lahman dict
+RDATA_LOADERS = {
+    "HallOfFame": load_hall_of_fame,
+    "AwardsPlayers": load_awards,
+    "AllstarFull": load_allstar,
+    "Teams": load_team_records,
+}
+
+
 def load_lahman_rdata():
     """Load supplementary data from Lahman RData files."""
     result = {}
+    for name in LAHMAN_TABLES:
+        result.update(RDATA_LOADERS[name]())
+    return result
 
-    # Hall of Fame — set of inducted playerIDs
-    hof_set = set()
-    try:
-        hof_data = pyreadr.read_r(os.path.join(LAHMAN_DIR, "HallOfFame.RData"))
-        df = list(hof_data.values())[0]
-        inducted = df[(df["inducted"] == "Y") & (df["category"] == "Player")]
-        hof_set = set(inducted["playerID"].unique())
-        print(f"  Loaded {len(hof_set)} HOF inductees from HallOfFame.RData")
-    except Exception as e:
-        print(f"  Warning: Could not load HallOfFame.RData: {e}")
-    result["hof"] = hof_set
 
-    # Awards — {(playerID, yearID): [award_codes]}
-    awards_by_py = defaultdict(list)
+class ThreadOutput(io.TextIOBase):
+    """sys.stdout stand-in that sends a thread's prints to its own buffer
+    while captured() runs there, and everything else to the real stream."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def write(self, text):
+        return getattr(self.local, "buffer", self.stream).write(text)
+
+    def flush(self):
+        getattr(self.local, "buffer", self.stream).flush()
+
+
+def captured(fn, *args):
+    """Run fn(*args) with its output buffered; returns (result, text).  On
+    error the buffered text is printed before the exception propagates."""
+    buffer = io.StringIO()
+    if isinstance(sys.stdout, ThreadOutput):
+        sys.stdout.local.buffer = buffer
+        restore = functools.partial(delattr, sys.stdout.local, "buffer")
+    else:
+        stdout, sys.stdout = sys.stdout, buffer
+        restore = functools.partial(setattr, sys, "stdout", stdout)
     try:
-        awards_data = pyreadr.read_r(os.path.join(LAHMAN_DIR, "AwardsPlayers.RData"))
-        df = list(awards_data.values())[0]
-        for _, row in df.iterrows():
-            code = AWARD_MAP.get(row["awardID"])
-            if code:
-                key = (row["playerID"], int(row["yearID"]))
-                if code not in awards_by_py[key]:
-                    awards_by_py[key].append(code)
-        print(f"  Loaded {len(awards_by_py)} player-year award entries")
-    except Exception as e:
-        print(f"  Warning: Could not load AwardsPlayers.RData: {e}")
-    result["awards"] = dict(awards_by_py)
+        result = fn(*args)
+    except BaseException:
+        restore()
+        print(buffer.getvalue(), end="")
+        raise
+    restore()
+    return result, buffer.getvalue()
+
+
+def load_rdata_in_worker(name, profiling, archives):
+    global ARCHIVES
+    ARCHIVES = archives
+    PROFILER.configure(*profiling)
+    part, text = captured(RDATA_LOADERS[name])
+    return part, text, PROFILER.drain()
+
+
+def load_csv_stats(stage, path, loader, use_cache, params):
+    with PROFILER.stage(f"csv:{stage.capitalize()}"):
+        return cached(stage, [path], functools.partial(loader, params), use_cache, params)
+
+
+def load_inputs(teams, use_cache=True, full_roster=False):
+    """Load Batting.csv, Pitching.csv and the Lahman tables concurrently:
+    the CSVs on threads (the pandas parser runs outside the GIL) and each
+    RData table in its own process (decompression is CPU-bound).  Results
+    and log lines are merged in the sequential order, so a build's output
+    and log read the same as one loading them one after another.  With
+    full_roster, lahman["people"] also maps playerID to name.
+
+    Returns (batting, pitching, lahman)."""
+    params = tuple(teams)
+    rdata_files = [os.path.join(LAHMAN_DIR, f"{name}.RData") for name in LAHMAN_TABLES]
+
+    with PROFILER.stage("lahman"):
+        lahman_entry = cache_entry("lahman", rdata_files, use_cache)
+        lahman, lahman_log = captured(cache_load, "lahman", lahman_entry)
+
+    # Submit the table reads before any thread starts: the pool forks its
+    # workers on first submit, and forking a threaded process is unsafe.
+    # Importing pyreadr (and pandas) first lets every worker inherit it.
+    rdata_pool = None
+    if lahman is MISSING:
+        import pyreadr  # noqa: F401
+
+        rdata_pool = ProcessPoolExecutor(max_workers=min(len(LAHMAN_TABLES), os.cpu_count() or 1))
+        tables = [rdata_pool.submit(load_rdata_in_worker, name, PROFILER.settings, ARCHIVES)
+                  for name in LAHMAN_TABLES]
+
+    stdout = sys.stdout
+    sys.stdout = ThreadOutput(stdout)
+    try:
+        with ThreadPoolExecutor(max_workers=2) as threads:
+            csvs = [threads.submit(captured, load_csv_stats, "batting", BATTING_CSV,
+                                   load_batting_stats, use_cache, params),
+                    threads.submit(captured, load_csv_stats, "pitching", PITCHING_CSV,
+                                   load_pitching_stats, use_cache, params)]
+            (batting, batting_log), (pitching, pitching_log) = [f.result() for f in csvs]
+    finally:
+        sys.stdout = stdout
+    print(batting_log + pitching_log, end="")
 
-    # All-Star — {(playerID, yearID)} set
-    allstar_set = set()
+    print("Loading Lahman RData files...")
+    print(lahman_log, end="")
+    if rdata_pool is not None:
+        with rdata_pool:
+            lahman = {}
+            for future in tables:
+                part, text, stages = future.result()
+                print(text, end="")
+                PROFILER.stages.extend(stages)
+                lahman.update(part)
+        cache_store("lahman", lahman_entry, lahman)
+
+    if full_roster:
+        # Cached on its own: People is the largest table and only this mode reads it
+        with PROFILER.stage("rdata:People"):
+            people = cached("people", [os.path.join(LAHMAN_DIR, "People.RData")],
+                            load_people, use_cache)
+        lahman = dict(lahman, people=people)
+
+    return batting, pitching, lahman
+
+
+def file_digest(path):
+    """SHA-256 of a file's contents, read in chunks."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def config_digest(names=LOADER_CONFIG):
+    """SHA-256 of the named module-level tables as they are now, so --watch's
+    reload_config() invalidates whatever they fed."""
+    return hashlib.sha256(repr([(name, globals()[name]) for name in names]).encode()).hexdigest()
+
+
+# Returned by cache_load() when there is no usable entry
+MISSING = object()
+
+
+def cache_entry(stage, inputs, use_cache=True, params=()):
+    """Path of the cache entry for stage on the current content of its input
+    files and any extra params that change its result, or None when caching
+    is off.  Missing inputs bypass the cache so the loader's own warnings
+    still show."""
+    if not use_cache or not all(input_exists(p) for p in inputs):
+        return None
+
+    h = hashlib.sha256(f"{stage}:{CACHE_VERSION}:{config_digest()}:{params!r}".encode())
+    for path in inputs:
+        h.update(input_digest(path).encode())
+    return os.path.join(CACHE_DIR, f"{stage}-{h.hexdigest()[:16]}.pickle")
+
+
+def cache_load(stage, entry):
+    """Cached result at entry, or MISSING."""
+    if entry is None:
+        return MISSING
+    if os.path.exists(entry):
+        try:
+            with open(entry, "rb") as f:
+                result = pickle.load(f)
+            os.utime(entry)
+            print(f"  Using cached {stage} ({os.path.basename(entry)})")
+            PROFILER.note(cache="hit")
+            return result
+        except Exception as e:
+            print(f"  Warning: Discarding unreadable cache entry {entry}: {e}")
+    PROFILER.note(cache="miss")
+    return MISSING
+
+
+def cache_store(stage, entry, result):
+    if entry is None:
+        return
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = entry + ".tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, entry)
+    evict_cache(stage)
+
+
+def cached(stage, inputs, loader, use_cache=True, params=()):
+    """Return loader(), memoized in CACHE_DIR (see cache_entry)."""
+    entry = cache_entry(stage, inputs, use_cache, params)
+    result = cache_load(stage, entry)
+    if result is MISSING:
+        result = loader()
+        cache_store(stage, entry, result)
+    return result
+
+
+def evict_cache(stage, keep=CACHE_KEEP):
+    """Drop all but the `keep` most recently used entries for a stage."""
+    prefix = f"{stage}-"
+    entries = [os.path.join(CACHE_DIR, name) for name in os.listdir(CACHE_DIR)
+               if name.startswith(prefix) and name.endswith(".pickle")]
+    entries.sort(key=os.path.getmtime, reverse=True)
+    for path in entries[keep:]:
+        os.remove(path)
+
+
+def reset_peak_rss():
+    """Reset the kernel's RSS high-water mark so the next reading covers one
+    stage (Linux only; elsewhere peaks are cumulative)."""
     try:
-        as_data = pyreadr.read_r(os.path.join(LAHMAN_DIR, "AllstarFull.RData"))
-        df = list(as_data.values())[0]
-        for _, row in df.iterrows():
-            allstar_set.add((row["playerID"], int(row["yearID"])))
-        print(f"  Loaded {len(allstar_set)} All-Star appearances")
-    except Exception as e:
-        print(f"  Warning: Could not load AllstarFull.RData: {e}")
-    result["allstar"] = allstar_set
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
 
-    # Teams — {yearID: {"W": w, "L": l}} for NYA
-    team_records = {}
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB."""
     try:
-        teams_data = pyreadr.read_r(os.path.join(LAHMAN_DIR, "Teams.RData"))
-        df = list(teams_data.values())[0]
-        nya = df[df["teamID"] == "NYA"]
-        for _, row in nya.iterrows():
-            year = int(row["yearID"])
-            team_records[year] = {"W": int(row["W"]), "L": int(row["L"])}
-        print(f"  Loaded {len(team_records)} NYA season records from Teams.RData")
-    except Exception as e:
-        print(f"  Warning: Could not load Teams.RData: {e}")
-    result["records"] = team_records
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+class Profiler:
+    """--profile instrumentation: wall time, CPU time, peak RSS and rows
+    in/out per named stage.  Stages nest (an RData table inside "lahman");
+    a parent's peak covers its children.  One stage name, or every stage
+    sharing its prefix before ":", can also run under cProfile.  Disabled,
+    stage() costs one attribute check.
+
+    CPU time is per thread, so the concurrent input loaders are measured
+    separately, but they share one process-wide RSS peak."""
+
+    def __init__(self):
+        self.enabled = False
+        self.target = None
+        self.prof_dir = None
+        self.stages = []
+        self._local = threading.local()
+
+    @property
+    def _open(self):
+        if not hasattr(self._local, "open"):
+            self._local.open = []
+        return self._local.open
+
+    @property
+    def settings(self):
+        """configure() arguments, for handing to pool workers."""
+        return self.enabled, self.target, self.prof_dir
+
+    def configure(self, enabled, target=None, prof_dir=None):
+        self.enabled = enabled
+        self.target = target
+        self.prof_dir = prof_dir
+        self.stages = []
+
+    @contextlib.contextmanager
+    def stage(self, name, **counts):
+        if not self.enabled:
+            yield
+            return
+
+        record = {"stage": name, "rows_in": None, "rows_out": None, **counts}
+        self._open.append(record)
+        profile = None
+        if self.target in (name, name.split(":")[0]):
+            profile = cProfile.Profile()
+        reset_peak_rss()
+        wall = time.perf_counter()
+        cpu = time.thread_time()
+        if profile:
+            profile.enable()
+        try:
+            yield
+        finally:
+            if profile:
+                profile.disable()
+            record["wall_s"] = round(time.perf_counter() - wall, 4)
+            record["cpu_s"] = round(time.thread_time() - cpu, 4)
+            record["peak_rss_mb"] = round(max(peak_rss_mb(), record.pop("_child_peak", 0)), 1)
+            self._open.pop()
+            if self._open:
+                parent = self._open[-1]
+                parent["_child_peak"] = max(parent.get("_child_peak", 0), record["peak_rss_mb"])
+            if profile:
+                record["cprofile"] = self._dump(name, profile)
+            self.stages.append(record)
+
+    def note(self, **counts):
+        """Set rows_in/rows_out (or any other field) on the innermost stage."""
+        if self.enabled and self._open:
+            self._open[-1].update(counts)
+
+    def drain(self):
+        """Return and forget the stages recorded so far (pool workers hand
+        theirs back to the parent this way)."""
+        stages, self.stages = self.stages, []
+        return stages
+
+    def _dump(self, name, profile):
+        path = os.path.join(self.prof_dir, f"build-profile-{name.replace(':', '-')}.prof")
+        os.makedirs(self.prof_dir, exist_ok=True)
+        profile.dump_stats(path)
+        stats = pstats.Stats(profile)
+        top = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:25]
+        return {
+            "stats": path,
+            "top": [{"function": f"{func[0]}:{func[1]}({func[2]})", "calls": calls,
+                     "tottime": round(tottime, 4), "cumtime": round(cumtime, 4)}
+                    for func, (_, calls, tottime, cumtime, _) in top],
+        }
+
+
+PROFILER = Profiler()
 
-    return result
+
+def profile_report_path():
+    """JSON report written by --profile, in PROFILE_DIR."""
+    return os.path.join(PROFILE_DIR, "build-profile.json")
+
+
+def write_profile_report(total):
+    stages = PROFILER.stages
+    report = {
+        "started": time.strftime("%Y-%m-%dT%H:%M:%S%z", time.localtime(total["started"])),
+        "argv": sys.argv,
+        "total": {k: v for k, v in total.items() if k != "started"},
+        "stages": stages,
+    }
+    path = profile_report_path()
+    write_json(path, report)
+
+    print(f"\nWrote {path}")
+    print(f"  {'stage':<24} {'wall s':>8} {'cpu s':>8} {'peak MB':>8} {'rows in':>9} "
+          f"{'kept':>9} {'rows out':>9}")
+    for rec in sorted(stages, key=lambda r: r["wall_s"], reverse=True)[:12]:
+        rows_in = "" if rec["rows_in"] is None else rec["rows_in"]
+        kept = rec.get("rows_kept", "")
+        rows_out = "" if rec["rows_out"] is None else rec["rows_out"]
+        print(f"  {rec['stage']:<24} {rec['wall_s']:>8.3f} {rec['cpu_s']:>8.3f} "
+              f"{rec['peak_rss_mb']:>8.0f} {rows_in:>9} {kept:>9} {rows_out:>9}")
+
+
+# Rate stats derive_stats() adds to the batting and pitching tables; entries
+# get each one that is defined (OPS+ and ERA+ need a league baseline)
+HITTER_DERIVED = ("OBP", "SLG", "OPS", "OPS+")
+PITCHER_DERIVED = ("WHIP", "K9", "ERA+")
+
+
+def league_columns(table, baselines):
+    """(lgOBP, lgSLG, lgERA) arrays aligned with table's rows, NaN for
+    seasons without a baseline."""
+    import numpy as np
+
+    years, rows = np.unique(table.years(), return_inverse=True)
+    nan = (math.nan,) * 3
+    lookup = np.array([baselines.get(int(y), nan) for y in years], dtype="float64")
+    return lookup.reshape(-1, 3)[rows].T
+
+
+def derive_stats(batting, pitching, lahman):
+    """Add HITTER_DERIVED and PITCHER_DERIVED columns to every team's
+    StatTable, each one array expression over all of the table's
+    player-seasons.  Undefined values (no AB, no outs, no baseline) are NaN.
+    Returns the number of player-seasons covered."""
+    import numpy as np
+
+    baselines = lahman.get("baselines", {})
+    count = 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for team, table in batting.items():
+            col = table.column
+            lg_obp, lg_slg, _ = league_columns(table, baselines.get(team, {}))
+            on_base = col("H") + col("BB") + col("HBP")
+            obp = on_base / (col("AB") + col("BB") + col("HBP") + col("SF"))
+            slg = (col("H") + col("2B") + 2 * col("3B") + 3 * col("HR")) / col("AB")
+            table.add_column("OBP", np.round(obp, 3))
+            table.add_column("SLG", np.round(slg, 3))
+            table.add_column("OPS", np.round(obp + slg, 3))
+            table.add_column("OPS+", np.round(100 * (obp / lg_obp + slg / lg_slg - 1)))
+            count += len(table)
+
+        for team, table in pitching.items():
+            col = table.column
+            _, _, lg_era = league_columns(table, baselines.get(team, {}))
+            outs = col("IPouts")
+            era = 27 * col("ER") / outs
+            table.add_column("WHIP", np.round(3 * (col("BB") + col("H")) / outs, 2))
+            table.add_column("K9", np.round(27 * col("SO") / outs, 1))
+            table.add_column("ERA+", np.round(100 * lg_era / era))
+            count += len(table)
+    return count
+
+
+def add_derived(entry, stats, fields):
+    """Copy the defined derived stats from a StatRow onto an entry; OPS+ and
+    ERA+ as ints."""
+    for key in fields:
+        value = stats.get(key)
+        if value is None or not math.isfinite(value):
+            continue
+        entry[key] = int(value) if key.endswith("+") else value
 
 
 def compute_avg(h, ab):
@@ -350,14 +1388,14 @@ def compute_era(er, ipouts):
     return round(era, 2)
 
 
-def enrich_player(entry, pid, year, lahman):
+def enrich_player(entry, pid, year, lahman, config):
     """Add retiredNum, hof, nickname, and awards to a player entry."""
-    if pid in RETIRED_NUMBERS:
-        entry["retiredNum"] = RETIRED_NUMBERS[pid]
+    if pid in config["retiredNumbers"]:
+        entry["retiredNum"] = config["retiredNumbers"][pid]
     if pid in lahman["hof"]:
         entry["hof"] = True
-    if pid in NICKNAMES:
-        entry["nickname"] = NICKNAMES[pid]
+    if pid in config["nicknames"]:
+        entry["nickname"] = config["nicknames"][pid]
 
     # Awards for this season
     awards = []
@@ -371,98 +1409,428 @@ def enrich_player(entry, pid, year, lahman):
         entry["awards"] = awards
 
 
-def build_leaderboards(years_data, lahman):
-    """Build cumulative leaderboard data for MVPs, Cy Youngs, All-Stars, WS wins."""
-    # Collect all playerIDs that appear in our roster data, with names
-    player_names = {}
-    player_ws_wins = defaultdict(int)
+def roster_entries(roster):
+    """Yield (pos, role, entry) for every player on an enriched roster, using
+    the same slot labels as the client (SP1..SP5, CL)."""
+    for pos, p in roster.get("position_players", {}).items():
+        yield pos, "hitter", p
+    for i, sp in enumerate(roster.get("pitchers", {}).get("starters", [])):
+        yield f"SP{i + 1}", "starter", sp
+    cl = roster.get("pitchers", {}).get("closer")
+    if cl:
+        yield "CL", "closer", cl
+    # --full-roster only
+    for p in roster.get("bench", []):
+        yield "BN", "bench", p
+    for rp in roster.get("pitchers", {}).get("bullpen", []):
+        yield "RP", "reliever", rp
+
+
+def normalize_name(text):
+    """Lowercase, strip accents and punctuation.  Must match normalizeName()
+    in js/data.js, which applies the same rules to the query."""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    return re.sub(r"[^a-z0-9]+", " ", text).strip()
+
+
+def build_search_index(years_data):
+    """Build the client's player search artifact.
+
+    players is ordered by number of seasons (most first), so every posting
+    list is already in result order.  grams maps each 3-character substring
+    of a player's normalized name + nickname to player positions (queries of
+    3+ characters); prefixes maps 1- and 2-character word starts (shorter
+    queries)."""
+    players = {}
+    for year_str, roster in sorted(years_data.items(), key=lambda x: int(x[0])):
+        for pos, role, p in roster_entries(roster):
+            if not p.get("name"):
+                continue
+            key = p.get("playerID") or p["name"].lower()
+            rec = players.get(key)
+            if rec is None:
+                rec = players[key] = {"id": p.get("playerID"), "name": p["name"],
+                                      "apps": [], "awards": {}}
+            if p.get("nickname"):
+                rec["nickname"] = p["nickname"]
+            rec["apps"].append([int(year_str), pos, role])
+            for code in p.get("awards", []):
+                rec["awards"][code] = rec["awards"].get(code, 0) + 1
+
+    ordered = sorted(players.values(), key=lambda r: (-len(r["apps"]), r["name"]))
+    grams = defaultdict(list)
+    prefixes = defaultdict(list)
+    for i, rec in enumerate(ordered):
+        rec["key"] = normalize_name(f"{rec['name']} {rec.get('nickname', '')}")
+        for gram in sorted({rec["key"][j:j + 3] for j in range(len(rec["key"]) - 2)}):
+            grams[gram].append(i)
+        starts = {token[:n] for token in rec["key"].split() for n in (1, 2)}
+        for prefix in sorted(starts):
+            prefixes[prefix].append(i)
+
+    return {"players": ordered, "grams": grams, "prefixes": prefixes}
+
+
+# Leaderboard definitions, ranked over the roster's player-seasons:
+#   award     seasons on the roster with that Lahman award code ("AS" is an
+#             All-Star selection)
+#   ws        World Series titles won on the roster
+#   career    stat totalled over the player's roster entries in `roles`
+#   season    best single-season value of stat; one row per player-season
+# Ties rank by name, then playerID, so output never depends on set order.
+HITTER_ROLES = ("hitter", "bench")
+PITCHER_ROLES = ("starter", "closer", "reliever")
+LEADERBOARDS = {
+    "mvp": {"kind": "award", "code": "MVP"},
+    "cyYoung": {"kind": "award", "code": "CY"},
+    "allStar": {"kind": "award", "code": "AS"},
+    "wsWins": {"kind": "ws"},
+    "careerHR": {"kind": "career", "stat": "HR", "roles": HITTER_ROLES},
+    "careerH": {"kind": "career", "stat": "H", "roles": HITTER_ROLES},
+    "careerRBI": {"kind": "career", "stat": "RBI", "roles": HITTER_ROLES},
+    "careerW": {"kind": "career", "stat": "W", "roles": PITCHER_ROLES},
+    "careerSO": {"kind": "career", "stat": "SO", "roles": PITCHER_ROLES},
+    "careerSV": {"kind": "career", "stat": "SV", "roles": PITCHER_ROLES},
+    "seasonHR": {"kind": "season", "stat": "HR", "roles": HITTER_ROLES},
+    "seasonRBI": {"kind": "season", "stat": "RBI", "roles": HITTER_ROLES},
+    "seasonW": {"kind": "season", "stat": "W", "roles": PITCHER_ROLES},
+    "seasonSO": {"kind": "season", "stat": "SO", "roles": PITCHER_ROLES},
+    "seasonSV": {"kind": "season", "stat": "SV", "roles": PITCHER_ROLES},
+}
+LEADERBOARD_SIZE = 5
+
+
+def board_plan(boards=LEADERBOARDS):
+    """boards regrouped for season_tally: (award boards as (key, code), ws
+    boards, role -> [(stat, roles, [(key, is_season)])]).  Boards sharing a
+    stat and roles (careerHR, seasonHR) share one sum, and a role only
+    visits the sums it can add to."""
+    awards, ws, sums = [], [], defaultdict(list)
+    for key, board in boards.items():
+        if board["kind"] == "award":
+            awards.append((key, board["code"]))
+        elif board["kind"] == "ws":
+            ws.append(key)
+        else:
+            sums[board["stat"], board["roles"]].append((key, board["kind"] == "season"))
+    by_role = defaultdict(list)
+    for (stat, roles), targets in sums.items():
+        for role in roles:
+            by_role[role].append((stat, roles, targets))
+    return awards, ws, dict(by_role)
+
+
+def season_tally(year, roster, lahman, boards=LEADERBOARDS, k=LEADERBOARD_SIZE, plan=None):
+    """One season's contribution to the leaderboards:
+
+        names   playerID -> name as spelled that season
+        counts  board -> {playerID: n} for award, ws and career boards
+        best    board -> [(value, playerID, year)] for season boards, keeping
+                only rows that can still place: the k best values, ties
+                included, so ranking against other seasons stays exact
+
+    Tallies add up across seasons (merge_tallies), which is what lets an
+    incremental update swap one season's tally for a fresh one.  plan is
+    board_plan(boards), passed in when tallying many seasons."""
+    awards, ws, by_role = plan or board_plan(boards)
+    entries = defaultdict(list)  # a player listed twice shares one row
+    for _, role, entry in roster_entries(roster):
+        if entry.get("playerID"):
+            entries[entry["playerID"]].append((role, entry))
+    won = roster.get("worldSeries") == "won"
+
+    names = {}
+    counts = {key: {} for key, b in boards.items() if b["kind"] != "season"}
+    best = {key: [] for key, b in boards.items() if b["kind"] == "season"}
+    award_codes = lahman["awards"]
+    allstar = lahman["allstar"]
+    for pid, listed in entries.items():
+        names[pid] = listed[-1][1]["name"]
+        codes = award_codes.get((pid, year), ())
+        if (pid, year) in allstar:
+            codes = {*codes, "AS"}
+        if codes:
+            for key, code in awards:
+                if code in codes:
+                    counts[key][pid] = 1
+        if won:
+            for key in ws:
+                counts[key][pid] = 1
+
+        single = len(listed) == 1
+        if single:
+            role, entry = listed[0]
+            sums = by_role.get(role, ())
+        else:
+            sums = list({(stat, roles): (stat, roles, targets) for role, _ in listed
+                         for stat, roles, targets in by_role.get(role, ())}.values())
+        for stat, roles, targets in sums:
+            if single:
+                value = entry.get(stat, 0)
+            else:
+                value = sum(e.get(stat, 0) for r, e in listed if r in roles)
+            if value <= 0:
+                continue
+            for key, is_season in targets:
+                if is_season:
+                    best[key].append((value, pid, year))
+                else:
+                    counts[key][pid] = value
+
+    for key, rows in best.items():
+        best[key] = top_values(rows, k)
+    return {"names": names, "counts": counts, "best": best}
+
+
+def merge_tallies(tallies):
+    """Sum season tallies given oldest first; a later spelling of a name wins."""
+    names = {}
+    counts = defaultdict(lambda: defaultdict(int))
+    best = defaultdict(list)
+    for tally in tallies:
+        names.update(tally["names"])
+        for key, board in tally["counts"].items():
+            totals = counts[key]
+            for pid, value in board.items():
+                totals[pid] += value
+        for key, rows in tally["best"].items():
+            best[key].extend(rows)
+    return {"names": names, "counts": counts, "best": best}
+
+
+def rank_leaderboards(merged, boards=LEADERBOARDS, k=LEADERBOARD_SIZE):
+    """Top-k rows for every board from merged tallies."""
+    names = merged["names"]
+    result = {}
+    for key, board in boards.items():
+        if board["kind"] == "season":
+            top = sorted(top_values(merged["best"].get(key, ()), k),
+                         key=lambda s: (-s[0], names[s[1]], s[1], s[2]))[:k]
+            result[key] = [{"playerID": pid, "name": names[pid], "year": year, "count": value}
+                           for value, pid, year in top]
+        else:
+            counts = [(c, pid) for pid, c in merged["counts"].get(key, {}).items() if c > 0]
+            top = sorted(top_values(counts, k), key=lambda s: (-s[0], names[s[1]], s[1]))[:k]
+            result[key] = [{"playerID": pid, "name": names[pid], "count": c} for c, pid in top]
+    return result
 
-    for year_str, roster in years_data.items():
-        year = int(year_str)
-        is_ws_win = roster.get("worldSeries") == "won"
 
-        all_players = []
-        for pos, p in roster.get("position_players", {}).items():
-            all_players.append(p)
-        for sp in roster.get("pitchers", {}).get("starters", []):
-            all_players.append(sp)
-        cl = roster.get("pitchers", {}).get("closer")
-        if cl:
-            all_players.append(cl)
-
-        for p in all_players:
-            pid = p.get("playerID")
-            if pid:
-                player_names[pid] = p["name"]
-                if is_ws_win:
-                    player_ws_wins[pid] += 1
-
-    # Count awards only for years the player was actually on the Yankees roster
-    roster_pids = set(player_names.keys())
-    player_years = defaultdict(set)
+def top_values(rows, k):
+    """The rows (value first) whose value is among the k largest, ties
+    included, so only those need the name-ordered sort."""
+    rows = list(rows)
+    if len(rows) <= k:
+        return rows
+    cutoff = heapq.nlargest(k, (row[0] for row in rows))[-1]
+    return [row for row in rows if row[0] >= cutoff]
+
+
+def build_leaderboards(years_data, lahman, boards=LEADERBOARDS, k=LEADERBOARD_SIZE):
+    """Top-k rows for every board, from one tally per season."""
+    plan = board_plan(boards)
+    tallies = [season_tally(int(y), roster, lahman, boards, k, plan)
+               for y, roster in sorted(years_data.items(), key=lambda x: int(x[0]))]
+    return rank_leaderboards(merge_tallies(tallies), boards, k)
+
+
+# Similar players: every player-season, and every career, becomes a vector
+# of rates from its enriched entry, z-scored within its pool (hitters or
+# pitchers); its neighbors are the nearest other players in that space.
+SIMILAR_SIZE = 5
+SIMILAR_BLOCK = 512  # query rows per distance block; memory is block x pool size
+SIMILAR_POOLS = {  # pool: (roles, volume column, minimum volume per season or career)
+    "hitter": (HITTER_ROLES, "AB", 100),
+    "pitcher": (PITCHER_ROLES, "IPouts", 90),
+}
+SIMILAR_COLUMNS = {
+    "hitter": ("G", "AB", "H", "HR", "RBI", "R", "BB", "SB", "OBP", "SLG"),
+    "pitcher": ("G", "GS", "SV", "IPouts", "W", "L", "SO", "ERA", "WHIP"),
+}
+SIMILAR_RATES = ("OBP", "SLG", "ERA", "WHIP")  # weighted by volume when summed
+
+
+def similarity_rows(years_data, pool):
+    """(keys, values) for the pool's player-seasons with any volume: keys
+    are (playerID, yearID), values a float64 array of SIMILAR_COLUMNS.
+    Rates are multiplied by the season's volume, so summing a player's
+    rows gives career totals with volume-weighted rates; a missing rate
+    is NaN."""
+    import numpy as np
+
+    roles, volume, _ = SIMILAR_POOLS[pool]
+    columns = SIMILAR_COLUMNS[pool]
+    keys = []
+    rows = []
+    seen = set()
     for year_str, roster in years_data.items():
-        year = int(year_str)
-        for pos, p in roster.get("position_players", {}).items():
-            if p.get("playerID"):
-                player_years[p["playerID"]].add(year)
-        for sp in roster.get("pitchers", {}).get("starters", []):
-            if sp.get("playerID"):
-                player_years[sp["playerID"]].add(year)
-        cl = roster.get("pitchers", {}).get("closer")
-        if cl and cl.get("playerID"):
-            player_years[cl["playerID"]].add(year)
-
-    mvp_counts = defaultdict(int)
-    cy_counts = defaultdict(int)
-    as_counts = defaultdict(int)
-
-    for (pid, year), codes in lahman["awards"].items():
-        if pid not in roster_pids or year not in player_years.get(pid, set()):
-            continue
-        if "MVP" in codes:
-            mvp_counts[pid] += 1
-        if "CY" in codes:
-            cy_counts[pid] += 1
-
-    for (pid, year) in lahman["allstar"]:
-        if pid in roster_pids and year in player_years.get(pid, set()):
-            as_counts[pid] += 1
+        for _, role, entry in roster_entries(roster):
+            pid = entry.get("playerID")
+            key = (pid, int(year_str))
+            if role not in roles or not pid or not entry.get(volume) or key in seen:
+                continue
+            seen.add(key)
+            keys.append(key)
+            rows.append([(entry[col] * entry[volume] if col in entry else math.nan)
+                         if col in SIMILAR_RATES else entry.get(col, 0) for col in columns])
+    return keys, np.array(rows, dtype=np.float64).reshape(len(rows), len(columns))
+
+
+def similarity_features(pool, values):
+    """Standardized feature matrix for rows of similarity_rows() values."""
+    import numpy as np
+
+    c = dict(zip(SIMILAR_COLUMNS[pool], values.T))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if pool == "hitter":
+            ab = c["AB"]
+            features = [c["H"] / ab, c["HR"] / ab, c["RBI"] / ab, c["R"] / ab, c["BB"] / ab,
+                        c["SB"] / c["G"], ab / c["G"], c["OBP"] / ab, c["SLG"] / ab]
+        else:
+            outs = c["IPouts"]
+            features = [27 * c["SO"] / outs, c["W"] / (c["W"] + c["L"]), c["GS"] / c["G"],
+                        c["SV"] / c["G"], outs / c["G"], c["ERA"] / outs, c["WHIP"] / outs]
+        matrix = np.column_stack(features)
+        matrix[~np.isfinite(matrix)] = np.nan
+        spread = np.nanstd(matrix, axis=0)
+        matrix = (matrix - np.nanmean(matrix, axis=0)) / np.where(spread > 0, spread, 1)
+    return np.nan_to_num(matrix, nan=0.0)  # unknown reads as average
+
+
+def nearest_neighbors(points, groups, k, block=SIMILAR_BLOCK):
+    """Row indices of each point's k nearest points outside its own group,
+    nearest first (fewer when there aren't k).  Squared distances come
+    from one matrix product per block of rows, so memory stays at
+    block x len(points) however large the pool grows."""
+    import numpy as np
+
+    n = len(points)
+    k = min(k, n)
+    norms = np.einsum("ij,ij->i", points, points)
+    result = []
+    for start in range(0, n, block):
+        stop = min(start + block, n)
+        dist = norms[start:stop, None] + norms[None, :] - 2 * points[start:stop] @ points.T
+        dist[groups[start:stop, None] == groups[None, :]] = np.inf
+        nearest = np.argpartition(dist, k - 1, axis=1)[:, :k]
+        order = np.argsort(np.take_along_axis(dist, nearest, axis=1), axis=1, kind="stable")
+        nearest = np.take_along_axis(nearest, order, axis=1)
+        found = np.isfinite(np.take_along_axis(dist, nearest, axis=1))
+        result.extend(row[ok].tolist() for row, ok in zip(nearest, found))
+    return result
 
-    def top5(counts):
-        sorted_items = sorted(counts.items(), key=lambda x: -x[1])
-        return [{"playerID": pid, "name": player_names.get(pid, pid), "count": c}
-                for pid, c in sorted_items[:5] if c > 0]
 
-    return {
-        "mvp": top5(mvp_counts),
-        "cyYoung": top5(cy_counts),
-        "allStar": top5(as_counts),
-        "wsWins": top5(player_ws_wins),
+def build_similar(years_data, k=SIMILAR_SIZE):
+    """Neighbor table for the "similar players" card section:
+    {pool: {"seasons": {playerID: {yearID: [[playerID, yearID], ...]}},
+            "careers": {playerID: [playerID, ...]}}}, nearest first, never
+    the player himself.  Seasons and careers under the pool's minimum
+    volume are left out."""
+    import numpy as np
+
+    similar = {}
+    for pool, (_, volume, minimum) in SIMILAR_POOLS.items():
+        keys, values = similarity_rows(years_data, pool)
+        ids, groups = np.unique(np.array([pid for pid, _ in keys], dtype=str),
+                                return_inverse=True)
+        careers = np.zeros((len(ids), values.shape[1]))
+        np.add.at(careers, groups, values)
+        at = SIMILAR_COLUMNS[pool].index(volume)
+
+        seasons = {}
+        rows = np.flatnonzero(values[:, at] >= minimum)
+        if len(rows) > 1:
+            found = nearest_neighbors(similarity_features(pool, values[rows]), groups[rows], k)
+            for row, neighbors in zip(rows.tolist(), found):
+                pid, year = keys[row]
+                seasons.setdefault(pid, {})[str(year)] = [list(keys[rows[j]]) for j in neighbors]
+
+        by_career = {}
+        rows = np.flatnonzero(careers[:, at] >= minimum)
+        if len(rows) > 1:
+            found = nearest_neighbors(similarity_features(pool, careers[rows]), rows, k)
+            for row, neighbors in zip(rows.tolist(), found):
+                by_career[str(ids[row])] = [str(ids[rows[j]]) for j in neighbors]
+        similar[pool] = {"seasons": seasons, "careers": by_career}
+    return similar
+
+
+def team_config(team, lahman):
+    """Presentation config for a team: TEAMS entry or Teams.RData defaults."""
+    info = lahman.get("franchises", {}).get(team, {})
+    config = {
+        "teamName": info.get("name", team),
+        "output": OUTPUT if team == HOME_TEAM else os.path.join(TEAMS_OUTPUT_DIR, f"{team}.json"),
+        "wsWon": info.get("wsWon", []),
+        "wsLost": info.get("wsLost", []),
+        "eras": [],
+        "eraQuotes": {},
+        "retiredNumbers": {},
+        "nicknames": {},
+        "onThisDate": [],
     }
-
-
-def process():
-    print("Loading source data...")
-    with open(SOURCE) as f:
-        data = json.load(f)
-
-    batting = load_batting_stats()
-    pitching = load_pitching_stats()
-
-    print("Loading Lahman RData files...")
-    lahman = load_lahman_rdata()
-
-    nya = data["teams"]["NYA"]
+    config.update(TEAMS.get(team, {}))
+    return config
+
+
+def bench_entry(pid, bstats, year, people, lahman, config):
+    """Full-roster entry for a non-starting hitter, built from Batting.csv."""
+    entry = {"playerID": pid, "name": people.get(pid, pid), "G": bstats["G"]}
+    for key in ("AB", "H", "HR", "RBI", "R", "BB", "SB"):
+        entry[key] = bstats[key]
+    avg = compute_avg(bstats["H"], bstats["AB"])
+    if avg:
+        entry["AVG"] = avg
+    add_derived(entry, bstats, HITTER_DERIVED)
+    enrich_player(entry, pid, year, lahman, config)
+    return entry
+
+
+def bullpen_entry(pid, pstats, year, people, lahman, config):
+    """Full-roster entry for a non-starting pitcher, built from Pitching.csv."""
+    ipouts = pstats["IPouts"]
+    entry = {
+        "playerID": pid,
+        "name": people.get(pid, pid),
+        "G": pstats["G"],
+        "SV": pstats["SV"],
+        "IP": ipouts_to_ip(ipouts),
+        "IPouts": ipouts,
+        "W": pstats["W"],
+        "L": pstats["L"],
+        "SO": pstats["SO"],
+    }
+    era = compute_era(pstats["ER"], ipouts)
+    if era is not None:
+        entry["ERA"] = era
+    add_derived(entry, pstats, PITCHER_DERIVED)
+    enrich_player(entry, pid, year, lahman, config)
+    return entry
+
+
+def enrich_years(source, batting, pitching, lahman, config, people=None):
+    """Enrich one franchise's rosters with stats, awards and bio fields.
+    With people ({playerID: name}, the --full-roster mode) every other
+    player-season in batting/pitching is added once, by primary role: under
+    pitchers["bullpen"] if he pitched in at least half as many games as he
+    played, else as "bench".
+
+    Returns (years_data, enriched_batters, enriched_pitchers)."""
+    if people is not None:
+        batting_years = batting.by_year() if batting else {}
+        pitching_years = pitching.by_year() if pitching else {}
+    ws_won = set(config["wsWon"])
+    ws_lost = set(config["wsLost"])
     years_data = {}
     enriched_batters = 0
     enriched_pitchers = 0
 
-    for year_str, roster in sorted(nya["years"].items(), key=lambda x: int(x[0])):
+    for year_str, roster in sorted(source["years"].items(), key=lambda x: int(x[0])):
         year = int(year_str)
         enriched = {
             "position_players": {},
             "pitchers": {"starters": [], "closer": None},
-            "worldSeries": "won" if year in WS_WON else ("lost" if year in WS_LOST else None),
+            "worldSeries": "won" if year in ws_won else ("lost" if year in ws_lost else None),
         }
 
         # Position players — enrich with batting stats
@@ -486,9 +1854,10 @@ def process():
                 avg = compute_avg(bstats["H"], bstats["AB"])
                 if avg:
                     entry["AVG"] = avg
+                add_derived(entry, bstats, HITTER_DERIVED)
                 enriched_batters += 1
 
-            enrich_player(entry, pid, year, lahman)
+            enrich_player(entry, pid, year, lahman, config)
             enriched["position_players"][pos] = entry
 
         # Starters — enrich with pitching stats
@@ -513,9 +1882,10 @@ def process():
                 era = compute_era(pstats["ER"], pstats["IPouts"])
                 if era is not None:
                     entry["ERA"] = era
+                add_derived(entry, pstats, PITCHER_DERIVED)
                 enriched_pitchers += 1
 
-            enrich_player(entry, pid, year, lahman)
+            enrich_player(entry, pid, year, lahman, config)
             enriched["pitchers"]["starters"].append(entry)
 
         # Closer — enrich with pitching stats
@@ -540,48 +1910,1165 @@ def process():
                 era = compute_era(pstats["ER"], pstats["IPouts"])
                 if era is not None:
                     entry["ERA"] = era
+                add_derived(entry, pstats, PITCHER_DERIVED)
                 enriched_pitchers += 1
 
-            enrich_player(entry, pid, year, lahman)
+            enrich_player(entry, pid, year, lahman, config)
             enriched["pitchers"]["closer"] = entry
 
+        if people is not None:
+            lineup = {e["playerID"] for _, _, e in roster_entries(enriched)}
+            hitters = dict(batting_years.get(year_str, []))
+            # A position player's mop-up inning leaves him on the bench, so
+            # his batting line still reaches the leaderboards
+            bullpen = [(pid, row) for pid, row in pitching_years.get(year_str, [])
+                       if pid not in lineup
+                       and 2 * row["G"] >= (hitters[pid]["G"] if pid in hitters else 0)]
+            relievers = {pid for pid, _ in bullpen}
+            bench = [(pid, row) for pid, row in hitters.items()
+                     if pid not in lineup and pid not in relievers]
+            enriched["bench"] = [
+                bench_entry(pid, row, year, people, lahman, config)
+                for pid, row in sorted(bench, key=lambda x: (-x[1]["G"], x[0]))
+            ]
+            enriched["pitchers"]["bullpen"] = [
+                bullpen_entry(pid, row, year, people, lahman, config)
+                for pid, row in sorted(bullpen, key=lambda x: (-x[1]["G"], x[0]))
+            ]
+            enriched_batters += len(bench)
+            enriched_pitchers += len(bullpen)
+
         years_data[year_str] = enriched
 
-    # Season records
+    return years_data, enriched_batters, enriched_pitchers
+
+
+def build_team(team, source, batting, pitching, lahman, config):
+    """Enrich one franchise's rosters and assemble its output document.
+
+    Returns (output, enriched_batters, enriched_pitchers)."""
+    with PROFILER.stage(f"enrich:{team}", rows_in=len(source.get("years", {}))):
+        years_data, enriched_batters, enriched_pitchers = enrich_years(
+            source, batting, pitching, lahman, config, lahman.get("people"))
+        PROFILER.note(rows_out=enriched_batters + enriched_pitchers)
+
+    # Leaderboards
+    with PROFILER.stage(f"leaderboards:{team}", rows_in=len(years_data)):
+        leaderboards = build_leaderboards(years_data, lahman)
+        PROFILER.note(rows_out=sum(len(v) for v in leaderboards.values()))
+
+    output = assemble_output(team, years_data, leaderboards, lahman, config)
+    return output, enriched_batters, enriched_pitchers
+
+
+def assemble_output(team, years_data, leaderboards, lahman, config):
+    """The output document around enriched rosters and their leaderboards."""
+    records = lahman["records"].get(team, {})
     season_records = {}
     for year_str in years_data:
         year = int(year_str)
-        if year in lahman["records"]:
-            season_records[year_str] = lahman["records"][year]
+        if year in records:
+            season_records[year_str] = records[year]
 
-    # Leaderboards
-    leaderboards = build_leaderboards(years_data, lahman)
-
-    output = {
-        "team": "NYA",
-        "teamName": "New York Yankees",
+    return {
+        "team": team,
+        "teamName": config["teamName"],
         "years": years_data,
-        "eras": ERAS,
-        "eraQuotes": ERA_QUOTES,
-        "wsWon": sorted(WS_WON),
-        "wsLost": sorted(WS_LOST),
+        "eras": config["eras"],
+        "eraQuotes": config["eraQuotes"],
+        "wsWon": sorted(config["wsWon"]),
+        "wsLost": sorted(config["wsLost"]),
         "seasonRecords": season_records,
-        "onThisDate": ON_THIS_DATE,
+        "onThisDate": config["onThisDate"],
         "leaderboards": leaderboards,
     }
 
-    os.makedirs(os.path.dirname(OUTPUT), exist_ok=True)
-    with open(OUTPUT, "w") as f:
-        json.dump(output, f, separators=(",", ":"))
 
-    size_kb = os.path.getsize(OUTPUT) / 1024
-    print(f"\nWrote {OUTPUT} ({size_kb:.1f} KB)")
-    print(f"  {len(years_data)} years ({min(years_data)}–{max(years_data)})")
-    print(f"  {len(WS_WON)} WS wins, {len(WS_LOST)} WS losses")
-    print(f"  Enriched {enriched_batters} batter-seasons, {enriched_pitchers} pitcher-seasons")
-    print(f"  {len(season_records)} season records, {len(ON_THIS_DATE)} OTD moments")
-    print(f"  Leaderboards: {', '.join(f'{k}({len(v)})' for k,v in leaderboards.items())}")
+# Career-constant fields that the normalized layout keeps once per player
+BIO_FIELDS = ("name", "nickname", "retiredNum", "hof")
+
+
+def normalize_output(output, players=None, only_years=None):
+    """Return output in the normalized layout: a "players" table holds
+    playerID and BIO_FIELDS once per player, and every season or leaderboard
+    entry refers to its row as "p" (the table doubles as the string
+    dictionary for IDs and names).  A season entry keeps a bio field only
+    where it differs from the table, e.g. a renamed player.  "IP" is dropped
+    since the client derives it from IPouts.  --full-roster's "bench" and
+    pitchers["bullpen"] lists are slimmed the same way.
+
+    An incremental update passes the players table it wrote before (new
+    players are appended, so existing "p" rows stay valid) and only_years,
+    the seasons to include in the result."""
+    players = list(players or [])
+    rows = {p["playerID"]: i for i, p in enumerate(players)}
+
+    def slim(entry):
+        pid = entry["playerID"]
+        if pid not in rows:
+            rows[pid] = len(players)
+            players.append({"playerID": pid,
+                            **{f: entry[f] for f in BIO_FIELDS if f in entry}})
+        bio = players[rows[pid]]
+        out = {"p": rows[pid]}
+        for k, v in entry.items():
+            if k in ("playerID", "IP") or (k in BIO_FIELDS and bio.get(k) == v):
+                continue
+            out[k] = v
+        return out
+
+    years = {}
+    for year_str, roster in output["years"].items():
+        if only_years is not None and year_str not in only_years:
+            continue
+        pitchers = roster["pitchers"]
+        closer = pitchers.get("closer")
+        years[year_str] = {
+            "position_players": {pos: slim(p) for pos, p in roster["position_players"].items()},
+            "pitchers": {
+                "starters": [slim(p) for p in pitchers.get("starters", [])],
+                "closer": slim(closer) if closer else None,
+            },
+            "worldSeries": roster["worldSeries"],
+        }
+        if "bench" in roster:
+            years[year_str]["bench"] = [slim(p) for p in roster["bench"]]
+            years[year_str]["pitchers"]["bullpen"] = [slim(p) for p in pitchers["bullpen"]]
+
+    def slim_row(e):
+        if e["playerID"] not in rows:
+            return e
+        return {"p": rows[e["playerID"]],
+                **{k: v for k, v in e.items() if k not in ("playerID", "name")}}
+
+    leaderboards = {key: [slim_row(e) for e in entries]
+                    for key, entries in output["leaderboards"].items()}
+
+    normalized = {"layout": "normalized", **output, "years": years, "leaderboards": leaderboards}
+    normalized["players"] = players
+    return normalized
+
+
+# Columnar binary export (<output>.columns.bin), one row per player-season:
+#
+#   header     <4sHHII  magic, version, column count, row count, string count
+#   directory  <16scBxxI per column: name, kind, decimal scale, data offset
+#   strings    <I offsets (string count + 1), then the UTF-8 blob
+#   columns    little-endian fixed-width cells; 4-byte columns are laid out
+#              before 2-byte ones so every column is aligned to its width
+#
+# Kinds: "i" int32 and "h" int16, where the type's minimum marks a missing
+# value and an optional decimal scale applies (ERA 2.63 is stored as 263);
+# "s" is a uint32 index into the interned string table, 0 being "".  The
+# layout maps straight onto memoryview/NumPy arrays and JS typed arrays.
+COLUMNAR_MAGIC = b"BXW1"
+COLUMNAR_VERSION = 1
+COLUMNAR_HEADER = struct.Struct("<4sHHII")
+COLUMNAR_DIRENT = struct.Struct("<16scBxxI")
+COLUMNAR_KINDS = {  # kind: (struct/memoryview format, width, null sentinel)
+    "i": ("i", 4, -2 ** 31),
+    "h": ("h", 2, -2 ** 15),
+    "s": ("I", 4, None),
+}
+COLUMNAR_COLUMNS = [
+    ("year", "h", 0), ("playerID", "s", 0), ("name", "s", 0), ("nickname", "s", 0),
+    ("role", "s", 0), ("pos", "s", 0), ("G", "h", 0), ("AB", "h", 0), ("H", "h", 0),
+    ("HR", "h", 0), ("RBI", "h", 0), ("R", "h", 0), ("BB", "h", 0), ("SB", "h", 0),
+    ("AVG", "h", 3), ("GS", "h", 0), ("SV", "h", 0), ("W", "h", 0), ("L", "h", 0),
+    ("SO", "h", 0), ("IPouts", "h", 0), ("ERA", "i", 2), ("hof", "h", 0),
+    ("retiredNum", "h", 0), ("awards", "s", 0), ("OBP", "h", 3), ("SLG", "h", 3),
+    ("OPS", "h", 3), ("OPS+", "h", 0), ("WHIP", "i", 2), ("K9", "h", 1), ("ERA+", "h", 0),
+]
+
+
+def columnar_rows(years_data):
+    """Flatten enriched rosters into one dict per player-season."""
+    for year_str, roster in sorted(years_data.items(), key=lambda x: int(x[0])):
+        for pos, role, p in roster_entries(roster):
+            row = dict(p, year=int(year_str), role=role, pos=pos)
+            if "AVG" in row:
+                # ".312" (and compute_avg's ".1000" for a perfect 1.000)
+                row["AVG"] = int(row["AVG"].lstrip(".")) / 1000
+            row["hof"] = 1 if p.get("hof") else 0
+            row["awards"] = ",".join(p.get("awards", []))
+            yield row
+
+
+def write_columnar(path, years_data):
+    """Write years_data in the columnar binary layout; returns size in bytes."""
+    rows = list(columnar_rows(years_data))
+    strings = {"": 0}
+    cells = {}
+    for name, kind, scale in COLUMNAR_COLUMNS:
+        fmt, width, null = COLUMNAR_KINDS[kind]
+        if kind == "s":
+            values = [strings.setdefault(r.get(name) or "", len(strings)) for r in rows]
+        else:
+            # Anything the column can't hold (an ERA+ off a near-zero ERA, or
+            # a rate from inconsistent inputs) is stored as missing
+            limit = 2 ** (8 * width - 1)
+            values = [null if r.get(name) is None else round(r[name] * 10 ** scale)
+                      for r in rows]
+            values = [v if null < v < limit else null for v in values]
+        cells[name] = struct.pack(f"<{len(rows)}{fmt}", *values)
+
+    blob = bytearray()
+    offsets = []
+    for text in strings:
+        offsets.append(len(blob))
+        blob += text.encode("utf-8")
+    offsets.append(len(blob))
+    string_table = struct.pack(f"<{len(offsets)}I", *offsets) + bytes(blob)
+    string_table += b"\0" * (-len(string_table) % 4)
+
+    layout = sorted(COLUMNAR_COLUMNS, key=lambda c: -COLUMNAR_KINDS[c[1]][1])
+    offset = (COLUMNAR_HEADER.size + COLUMNAR_DIRENT.size * len(COLUMNAR_COLUMNS)
+              + len(string_table))
+    offsets = {}
+    for name, _, _ in layout:
+        offsets[name] = offset
+        offset += len(cells[name])
+    directory = b"".join(
+        COLUMNAR_DIRENT.pack(name.encode("ascii"), kind.encode("ascii"), scale, offsets[name])
+        for name, kind, scale in COLUMNAR_COLUMNS)
+
+    with atomic_open(path, "wb") as f:
+        f.write(COLUMNAR_HEADER.pack(COLUMNAR_MAGIC, COLUMNAR_VERSION,
+                                     len(COLUMNAR_COLUMNS), len(rows), len(strings)))
+        f.write(directory)
+        f.write(string_table)
+        for name, _, _ in layout:
+            f.write(cells[name])
+    return os.path.getsize(path)
+
+
+def read_columnar(path):
+    """Map a columnar export without copying its cells.
+
+    Returns {"rows", "columns", "scales", "nulls", "strings"}: each column is
+    a memoryview of int32/int16 values or uint32 string ids over the mapped
+    file, ready for np.frombuffer(col, dtype=col.format) if NumPy is around.
+    Divide a numeric column by 10 ** scales[name] for its real value;
+    nulls[name] is its missing-value sentinel."""
+    with open(path, "rb") as f:
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(buf)
+
+    magic, version, ncols, nrows, nstrings = COLUMNAR_HEADER.unpack_from(view, 0)
+    if magic != COLUMNAR_MAGIC or version != COLUMNAR_VERSION:
+        raise ValueError(f"{path} is not a version {COLUMNAR_VERSION} columnar export")
+
+    pos = COLUMNAR_HEADER.size
+    directory = []
+    for _ in range(ncols):
+        name, kind, scale, offset = COLUMNAR_DIRENT.unpack_from(view, pos)
+        directory.append((name.rstrip(b"\0").decode("ascii"), kind.decode("ascii"), scale, offset))
+        pos += COLUMNAR_DIRENT.size
+
+    offsets = struct.unpack_from(f"<{nstrings + 1}I", view, pos)
+    base = pos + 4 * (nstrings + 1)
+    strings = [bytes(view[base + a:base + b]).decode("utf-8")
+               for a, b in zip(offsets, offsets[1:])]
+
+    columns = {}
+    scales = {}
+    nulls = {}
+    for name, kind, scale, offset in directory:
+        fmt, width, nulls[name] = COLUMNAR_KINDS[kind]
+        cells = view[offset:offset + width * nrows]
+        if sys.byteorder == "little":
+            columns[name] = cells.cast(fmt)
+        else:
+            arr = array.array(fmt, cells.tobytes())
+            arr.byteswap()
+            columns[name] = memoryview(arr)
+        scales[name] = scale
+    return {"rows": nrows, "columns": columns, "scales": scales, "nulls": nulls,
+            "strings": strings}
+
+
+# SQLite export (<output>.sqlite) for ad-hoc queries:
+#
+#   seasons       one row per player-season, the columnar export's numeric
+#                 columns ("+" spelled "_plus": OPS_plus, ERA_plus)
+#   players       playerID, name, nickname, retiredNum, hof (0/1)
+#   awards        playerID, year, code (AWARD_MAP codes, "AS" for All-Star)
+#   team_seasons  year, W, L, worldSeries ("won", "lost" or NULL)
+#   eras          id, label, start, end, tagline
+#
+# e.g. SELECT name, year, HR FROM seasons JOIN players USING (playerID)
+#      JOIN awards USING (playerID, year) WHERE HR >= 30 AND code = 'AS'
+SQLITE_BIO = ("name", "nickname", "hof", "retiredNum", "awards")
+SQLITE_SEASON_COLUMNS = [(name, "REAL" if scale else "INTEGER" if kind != "s" else "TEXT")
+                         for name, kind, scale in COLUMNAR_COLUMNS if name not in SQLITE_BIO]
+SQLITE_INDEXES = {
+    "seasons": ["playerID", "year", "role", "HR", "RBI", "AVG", "OPS", "W", "SO", "SV", "ERA"],
+    "awards": ["playerID", "year", "code"],
+}
+
+
+def sqlite_path(output_path):
+    """data/yankees.json -> data/yankees.sqlite"""
+    return f"{os.path.splitext(output_path)[0]}.sqlite"
+
+
+def sql_name(column):
+    return column.replace("+", "_plus")
+
+
+def write_sqlite(path, output):
+    """Write output's player-seasons, players, awards, team records and eras
+    to a fresh SQLite database: bulk inserts in one transaction, indexes
+    built after the load, then moved into place.  Returns size in bytes."""
+    years_data = output["years"]
+    rows = list(columnar_rows(years_data))
+    players = {}
+    awards = set()
+    for row in rows:
+        players[row["playerID"]] = (row["playerID"], row.get("name"), row.get("nickname"),
+                                    row.get("retiredNum"), row["hof"])
+        for code in filter(None, row["awards"].split(",")):
+            awards.add((row["playerID"], row["year"], code))
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    db = sqlite3.connect(tmp, isolation_level=None)
+    try:
+        # A scratch file until the os.replace below, so skip the journal
+        db.execute("PRAGMA journal_mode = OFF")
+        db.execute("PRAGMA synchronous = OFF")
+        db.execute("BEGIN")
+        columns = ", ".join(f"{sql_name(name)} {kind}" for name, kind in SQLITE_SEASON_COLUMNS)
+        db.execute(f"CREATE TABLE seasons ({columns})")
+        db.execute("CREATE TABLE players (playerID TEXT PRIMARY KEY, name TEXT, nickname TEXT, "
+                   "retiredNum INTEGER, hof INTEGER)")
+        db.execute("CREATE TABLE awards (playerID TEXT, year INTEGER, code TEXT)")
+        db.execute("CREATE TABLE team_seasons (year INTEGER PRIMARY KEY, W INTEGER, L INTEGER, "
+                   "worldSeries TEXT)")
+        db.execute("CREATE TABLE eras (id TEXT PRIMARY KEY, label TEXT, start INTEGER, "
+                   "end INTEGER, tagline TEXT)")
+
+        names = [name for name, _ in SQLITE_SEASON_COLUMNS]
+        db.executemany(f"INSERT INTO seasons VALUES ({', '.join('?' * len(names))})",
+                       ([row.get(name) for name in names] for row in rows))
+        db.executemany("INSERT INTO players VALUES (?, ?, ?, ?, ?)", players.values())
+        db.executemany("INSERT INTO awards VALUES (?, ?, ?)", sorted(awards))
+        records = output["seasonRecords"]
+        db.executemany("INSERT INTO team_seasons VALUES (?, ?, ?, ?)",
+                       ((int(y), records.get(y, {}).get("W"), records.get(y, {}).get("L"),
+                         roster.get("worldSeries"))
+                        for y, roster in sorted(years_data.items())))
+        db.executemany("INSERT INTO eras VALUES (?, ?, ?, ?, ?)",
+                       ((e["id"], e["label"], e["start"], e["end"], e.get("tagline"))
+                        for e in output["eras"]))
+
+        for table, index_columns in SQLITE_INDEXES.items():
+            for column in index_columns:
+                db.execute(f"CREATE INDEX {table}_{sql_name(column)} "
+                           f"ON {table} ({sql_name(column)})")
+        db.execute("COMMIT")
+        db.execute("ANALYZE")
+    finally:
+        db.close()
+    os.replace(tmp, path)
+    return os.path.getsize(path)
+
+
+@contextlib.contextmanager
+def atomic_open(path, mode="w"):
+    """open() a temporary file next to path that replaces it on a clean
+    exit, so a reader (say, a dev server) sees the old file or the new one,
+    never a partial write.  Creates parent directories."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    try:
+        with open(tmp, mode) as f:
+            yield f
+        os.replace(tmp, path)
+    finally:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp)
+
+
+def write_json(path, obj):
+    """Write compact JSON atomically; returns size in bytes."""
+    with atomic_open(path) as f:
+        json.dump(obj, f, separators=(",", ":"))
+    return os.path.getsize(path)
+
+
+def search_index_path(output_path):
+    """data/yankees.json -> data/yankees-search.json"""
+    return f"{os.path.splitext(output_path)[0]}-search.json"
+
+
+def similar_path(output_path):
+    """data/yankees.json -> data/yankees-similar.json"""
+    return f"{os.path.splitext(output_path)[0]}-similar.json"
+
+
+def shard_dir(output_path):
+    """Directory holding the sharded form of an output: data/yankees.json
+    shards into data/yankees/."""
+    return os.path.splitext(output_path)[0]
+
+
+def write_shards(output, directory):
+    """Write output as manifest.json plus one years/<year>.json per season.
+
+    The manifest carries everything except the rosters, with "seasons"
+    mapping each year to its shard path relative to the manifest, so the
+    client can render the first season after two small fetches.
+    Returns (manifest_path, total_bytes)."""
+    total = 0
+    for year_str, roster in output["years"].items():
+        total += write_json(os.path.join(directory, shard_path(year_str)), roster)
+
+    manifest_path, size = write_manifest(output, directory, output["years"])
+    return manifest_path, total + size
+
+
+def shard_path(year_str):
+    """A season's shard, relative to the manifest."""
+    return f"years/{year_str}.json"
+
+
+def shard_manifest(output, year_keys):
+    """output without its rosters, plus the shard path of every season in
+    year_keys."""
+    manifest = {k: v for k, v in output.items() if k != "years"}
+    manifest["seasons"] = {year_str: shard_path(year_str) for year_str in year_keys}
+    return manifest
+
+
+def write_manifest(output, directory, year_keys):
+    """Write directory/manifest.json (see shard_manifest).  Returns (path,
+    size)."""
+    manifest_path = os.path.join(directory, "manifest.json")
+    return manifest_path, write_json(manifest_path, shard_manifest(output, year_keys))
+
+
+def columnar_path(output_path):
+    """data/yankees.json -> data/yankees.columns.bin"""
+    return f"{os.path.splitext(output_path)[0]}.columns.bin"
+
+
+def compressed_variants(data):
+    """Yield (suffix, bytes) for each precompressed variant.  .br needs the
+    optional brotli package and is skipped without it."""
+    yield ".gz", gzip.compress(data, compresslevel=9, mtime=0)
+    try:
+        import brotli
+    except ImportError:
+        return
+    yield ".br", brotli.compress(data, quality=11)
+
+
+def publish_file(path, data=None):
+    """Write a content-hashed copy of path (or of data, named after path),
+    e.g. yankees.json -> yankees.1a2b3c4d5e.json, plus .gz/.br variants.
+    Returns the hashed path."""
+    if data is None:
+        with open(path, "rb") as f:
+            data = f.read()
+    stem, ext = os.path.splitext(path)
+    hashed = f"{stem}.{hashlib.sha256(data).hexdigest()[:10]}{ext}"
+
+    # Same name means same content, so an existing copy is already correct
+    if os.path.exists(hashed):
+        os.utime(hashed)
+    else:
+        with open(hashed, "wb") as f:
+            f.write(data)
+        for suffix, packed in compressed_variants(data):
+            with open(hashed + suffix, "wb") as f:
+                f.write(packed)
+
+    prune_published(stem, ext)
+    return hashed
+
+
+def prune_published(stem, ext, keep=PUBLISH_KEEP):
+    """Delete all but the `keep` newest hashed generations of one asset."""
+    directory, base = os.path.split(stem)
+    pattern = re.compile(re.escape(base) + r"\.[0-9a-f]{10}" + re.escape(ext) + "$")
+    versions = [os.path.join(directory, name) for name in os.listdir(directory)
+                if pattern.match(name)]
+    versions.sort(key=os.path.getmtime, reverse=True)
+    for old in versions[keep:]:
+        remove_published(old)
+
+
+def remove_published(hashed):
+    """Delete one hashed file and its compressed variants."""
+    for suffix in ("", ".gz", ".br"):
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(hashed + suffix)
+
+
+def data_rel(path):
+    """path relative to DATA_DIR, with forward slashes (asset manifest keys)."""
+    return os.path.relpath(path, DATA_DIR).replace(os.sep, "/")
+
+
+def team_asset_names(path):
+    """Every logical name a team whose JSON is at path can publish."""
+    return [data_rel(p) for p in (path, search_index_path(path), similar_path(path),
+                                  columnar_path(path),
+                                  os.path.join(shard_dir(path), "manifest.json"))]
+
+
+def publish_team(path, shard):
+    """Publish one team's artifacts.  Returns (assets, precache): the
+    logical -> hashed map and every hashed file the client may fetch, all
+    relative to DATA_DIR.  Shard manifests are rewritten to point at the
+    hashed season files before being hashed themselves."""
+    assets = {}
+    precache = []
+    for artifact in (path, search_index_path(path), similar_path(path), columnar_path(path)):
+        assets[data_rel(artifact)] = data_rel(publish_file(artifact))
+
+    if shard:
+        directory = shard_dir(path)
+        manifest_path = os.path.join(directory, "manifest.json")
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        for year_str, shard_rel in manifest["seasons"].items():
+            hashed = publish_file(os.path.join(directory, shard_rel))
+            manifest["seasons"][year_str] = os.path.relpath(hashed, directory).replace(os.sep, "/")
+            precache.append(data_rel(hashed))
+        data = json.dumps(manifest, separators=(",", ":")).encode()
+        assets[data_rel(manifest_path)] = data_rel(publish_file(manifest_path, data))
+
+    precache.extend(assets.values())
+    return assets, sorted(precache)
+
+
+def write_asset_manifest(built):
+    """Record {team: (output path, sharded, (assets, precache) or None when
+    not published)} in ASSET_MANIFEST, keeping entries for teams not
+    rebuilt this run.  A rebuilt team's entries are replaced, not merged:
+    names it no longer publishes (the shard manifest after a build without
+    --shard) are dropped, and hashed shard files it no longer publishes are
+    deleted."""
+    manifest = {"version": 1, "assets": {}, "precache": {}}
+    if os.path.exists(ASSET_MANIFEST):
+        with open(ASSET_MANIFEST) as f:
+            manifest = json.load(f)
+    layouts = manifest.setdefault("layouts", {})
+    for team, (path, sharded, published) in built.items():
+        assets, precache = published or ({}, [])
+        layouts[data_rel(path)] = "shards" if sharded else "single"
+        for name in team_asset_names(path):
+            manifest["assets"].pop(name, None)
+        manifest["assets"].update(assets)
+
+        shards = data_rel(shard_dir(path)) + "/"
+        previous = manifest["precache"].get(team, [])
+        if not any(name.startswith(shards) for name in precache):
+            for name in previous:
+                if name.startswith(shards):
+                    remove_published(os.path.join(DATA_DIR, name))
+        manifest["precache"][team] = precache
+    write_json(ASSET_MANIFEST, manifest)
+
+
+def write_similar(team, path, years_data):
+    """Write the team's similar-players table; returns its summary line."""
+    with PROFILER.stage(f"similar:{team}", rows_in=len(years_data)):
+        similar = build_similar(years_data)
+        size = write_json(similar_path(path), similar)
+        seasons = sum(len(years) for pool in similar.values()
+                      for years in pool["seasons"].values())
+        PROFILER.note(rows_out=seasons, bytes=size)
+    return f"Wrote {similar_path(path)} ({seasons} player-seasons, {size / 1024:.1f} KB)"
+
+
+def write_team(team, source, batting, pitching, lahman, config, options):
+    """Build one franchise and write its JSON, search index, similar-players
+    table, columnar export and, per the options dict, per-season shards, a SQLite database and hashed
+    published copies.
+    With options["incremental"], only the seasons whose inputs changed since
+    the last run are rebuilt when update_team() can; otherwise this full
+    build saves the state the next update starts from.
+    Returns (summary lines, publish result or None)."""
+    if options["incremental"]:
+        with PROFILER.stage(f"digest:{team}", rows_in=len(source.get("years", {}))):
+            digests = season_digests(source, batting, pitching, lahman, config)
+        result = update_team(team, source, batting, pitching, lahman, config, options, digests)
+        if result is not None:
+            return result
+
+    output, enriched_batters, enriched_pitchers = build_team(
+        team, source, batting, pitching, lahman, config)
+    return write_output(team, output, lahman, config, options,
+                        (enriched_batters, enriched_pitchers),
+                        digests if options["incremental"] else None)
+
+
+def write_output(team, output, lahman, config, options, enriched, digests=None):
+    """Write a built team's files (see write_team); enriched is the
+    (batter-seasons, pitcher-seasons) count for the summary.  With digests,
+    also save the state for the next incremental update.
+    Returns (summary lines, publish result or None)."""
+    enriched_batters, enriched_pitchers = enriched
+    years_data = output["years"]
+    leaderboards = output["leaderboards"]
+    path = config["output"]
+
+    with PROFILER.stage(f"json:{team}", rows_in=len(years_data)):
+        doc = output if options["legacy"] else normalize_output(output)
+        size = write_json(path, doc)
+        PROFILER.note(bytes=size)
+    lines = [f"\nWrote {path} ({size / 1024:.1f} KB)"]
+
+    with PROFILER.stage(f"columnar:{team}", rows_in=len(years_data)):
+        size = write_columnar(columnar_path(path), years_data)
+        PROFILER.note(bytes=size)
+    lines.append(f"Wrote {columnar_path(path)} ({size / 1024:.1f} KB)")
+
+    with PROFILER.stage(f"search:{team}", rows_in=len(years_data)):
+        search = build_search_index(years_data)
+        search_path = search_index_path(path)
+        search_kb = write_json(search_path, search) / 1024
+        PROFILER.note(rows_out=len(search["players"]))
+    lines.append(f"Wrote {search_path} ({len(search['players'])} players, {search_kb:.1f} KB)")
+    lines.append(write_similar(team, path, years_data))
+
+    manifest_path = os.path.join(shard_dir(path), "manifest.json")
+    if options["shard"]:
+        with PROFILER.stage(f"shards:{team}", rows_in=len(years_data)):
+            manifest_path, shard_bytes = write_shards(doc, shard_dir(path))
+        lines.append(f"Wrote {manifest_path} + {len(years_data)} season shards "
+                     f"({shard_bytes / 1024:.1f} KB)")
+    elif os.path.exists(manifest_path):
+        # The client prefers the manifest, so a stale one would hide this build
+        os.remove(manifest_path)
+        lines.append(f"Removed stale {manifest_path}")
+
+    if options["sqlite"]:
+        with PROFILER.stage(f"sqlite:{team}", rows_in=len(years_data)):
+            size = write_sqlite(sqlite_path(path), output)
+            PROFILER.note(bytes=size)
+        lines.append(f"Wrote {sqlite_path(path)} ({size / 1024:.1f} KB)")
+
+    if digests is not None:
+        save_incremental_state(team, path, lahman, options, digests, years_data, doc)
+
+    published = None
+    if options["publish"]:
+        with PROFILER.stage(f"publish:{team}"):
+            published = publish_team(path, options["shard"])
+        lines.append(f"Published {len(published[1])} hashed files "
+                     f"({', '.join(sorted(published[0].values()))})")
+    if years_data:
+        lines.append(f"  {len(years_data)} years ({min(years_data)}–{max(years_data)})")
+    lines += [
+        f"  {len(output['wsWon'])} WS wins, {len(output['wsLost'])} WS losses",
+        f"  Enriched {enriched_batters} batter-seasons, {enriched_pitchers} pitcher-seasons",
+        f"  {len(output['seasonRecords'])} season records, {len(output['onThisDate'])} OTD moments",
+        f"  Leaderboards: {', '.join(f'{k}({len(v)})' for k,v in leaderboards.items())}",
+    ]
+    return lines, published
+
+
+# --- Incremental updates (--incremental) ---
+#
+# A full build saves, per team and output path, each season's input digest,
+# its enriched roster and leaderboard tally, the running leaderboard counts
+# and the normalized players table.  The next run re-enriches only seasons
+# whose digest changed (a new or refreshed year), swaps their tallies in the
+# running counts, and rewrites just their shards, the search index, the
+# similar-players table and the columnar export.  The manifest is assembled
+# every run and rewritten when it differs, since Teams.RData or the config
+# can change it without touching a season; the single-file JSON and, with
+# --sqlite, the database are rewritten along with it.
+def season_digests(source, batting, pitching, lahman, config):
+    """{yearID: digest} over everything enrichment reads for one season: the
+    source roster, the season's Batting/Pitching rows (derived columns too,
+    so a new league baseline counts) and, per player, awards, All-Star,
+    HOF, retired number, nickname and People name.  A season with the
+    same digest enriches to the same roster."""
+    batting_years = batting.by_year() if batting else {}
+    pitching_years = pitching.by_year() if pitching else {}
+    people = lahman.get("people") or {}
+    ws = (set(config["wsWon"]), set(config["wsLost"]))
+    digests = {}
+    for year_str, roster in source["years"].items():
+        year = int(year_str)
+        h = hashlib.sha256(json.dumps(roster, sort_keys=True).encode())
+        h.update(repr([year in results for results in ws]).encode())
+        pids = {e["playerID"] for _, _, e in roster_entries(roster) if e.get("playerID")}
+        for rows in (batting_years.get(year_str, ()), pitching_years.get(year_str, ())):
+            for pid, row in rows:
+                pids.add(pid)
+                h.update(repr((pid, row.values())).encode())
+        for pid in sorted(pids):
+            h.update(repr((
+                pid, lahman["awards"].get((pid, year)), (pid, year) in lahman["allstar"],
+                pid in lahman["hof"], config["retiredNumbers"].get(pid),
+                config["nicknames"].get(pid), people.get(pid),
+            )).encode())
+        digests[year_str] = h.hexdigest()
+    return digests
+
+
+def incremental_state_path(team, output_path):
+    key = hashlib.sha256(os.path.abspath(output_path).encode()).hexdigest()[:8]
+    return os.path.join(CACHE_DIR, f"incremental-{team}-{key}.pickle")
+
+
+def incremental_key(options):
+    """What a saved state must have been built with, besides its inputs: its
+    tallies also depend on LEADERBOARDS."""
+    return repr((CACHE_VERSION, config_digest(LOADER_CONFIG + ("LEADERBOARDS",)),
+                 options["legacy"], options["full_roster"]))
+
+
+def save_incremental_state(team, path, lahman, options, digests, years_data, doc):
+    """Record a full build of team for the next update_team()."""
+    tallies = {y: season_tally(int(y), roster, lahman) for y, roster in years_data.items()}
+    merged = merge_tallies(tallies[y] for y in sorted(tallies, key=int))
+    manifest_path = os.path.join(shard_dir(path), "manifest.json")
+    cache_store(f"incremental-{team}", incremental_state_path(team, path), {
+        "key": incremental_key(options),
+        "digests": digests,
+        "years": years_data,
+        "tallies": tallies,
+        "counts": {key: dict(counts) for key, counts in merged["counts"].items()},
+        "names": merged["names"],
+        "players": doc.get("players"),
+        "manifest": file_digest(manifest_path),
+        "sqlite": options["sqlite"],
+    })
+
+
+def apply_tally(counts, tally, sign):
+    """Add (sign 1) or take back (sign -1) one season's counts."""
+    for key, board in tally["counts"].items():
+        totals = counts.setdefault(key, {})
+        for pid, value in board.items():
+            total = totals.get(pid, 0) + sign * value
+            if total:
+                totals[pid] = total
+            else:
+                totals.pop(pid, None)
+
+
+def update_team(team, source, batting, pitching, lahman, config, options, digests):
+    """Bring team's sharded output up to date from the saved state, doing
+    work only for seasons whose digest changed or that disappeared.
+    Returns write_team()'s (lines, published), or None when there is no
+    usable state and a full build is needed."""
+    path = config["output"]
+    directory = shard_dir(path)
+    manifest_path = os.path.join(directory, "manifest.json")
+    state = cache_load(f"incremental-{team}", incremental_state_path(team, path))
+    if state is MISSING:
+        return None
+    if (state["key"] != incremental_key(options) or not os.path.exists(manifest_path)
+            or file_digest(manifest_path) != state["manifest"]):
+        print(f"  Saved state does not match {manifest_path}, rebuilding {team} in full")
+        return None
+
+    changed = [y for y in sorted(digests, key=int) if state["digests"].get(y) != digests[y]]
+    removed = [y for y in state["digests"] if y not in digests]
+    years_data, tallies, counts, names = (state["years"], state["tallies"], state["counts"],
+                                          state["names"])
+
+    with PROFILER.stage(f"enrich:{team}", rows_in=len(changed)):
+        fresh, enriched_batters, enriched_pitchers = enrich_years(
+            {"years": {y: source["years"][y] for y in changed}}, batting, pitching, lahman,
+            config, lahman.get("people"))
+        PROFILER.note(rows_out=enriched_batters + enriched_pitchers)
+
+    with PROFILER.stage(f"leaderboards:{team}", rows_in=len(changed) + len(removed)):
+        touched = set()
+        for y in removed + changed:
+            old = tallies.pop(y, None)
+            if old:
+                apply_tally(counts, old, -1)
+                touched.update(old["names"])
+            years_data.pop(y, None)
+        for y in changed:
+            years_data[y] = fresh[y]
+            tallies[y] = season_tally(int(y), fresh[y], lahman)
+            apply_tally(counts, tallies[y], 1)
+            touched.update(tallies[y]["names"])
+        years_data = dict(sorted(years_data.items(), key=lambda x: int(x[0])))
+
+        # Latest spelling wins, as in merge_tallies()
+        latest_first = sorted(tallies, key=int, reverse=True)
+        for pid in touched:
+            names.pop(pid, None)
+            for y in latest_first:
+                if pid in tallies[y]["names"]:
+                    names[pid] = tallies[y]["names"][pid]
+                    break
+        best = defaultdict(list)
+        for tally in tallies.values():
+            for key, rows in tally["best"].items():
+                best[key].extend(rows)
+        leaderboards = rank_leaderboards({"names": names, "counts": counts, "best": best})
+
+    # The rest of the manifest (team name, eras, season records, ...) is not
+    # in the digests, so it is rebuilt every run and compared instead
+    output = assemble_output(team, years_data, leaderboards, lahman, config)
+    doc = output if options["legacy"] else normalize_output(output, state["players"], set(changed))
+    # A database last written before its seasons changed needs this run too
+    if not changed and not removed and (state.get("sqlite") or not options["sqlite"]):
+        with open(manifest_path, "rb") as f:
+            current = f.read()
+        manifest = json.dumps(shard_manifest(doc, years_data), separators=(",", ":"))
+        if manifest.encode() == current:
+            lines = [f"\n{manifest_path} is up to date ({len(digests)} seasons unchanged)"]
+            if not options["publish"]:
+                return lines, None
+            with PROFILER.stage(f"publish:{team}"):
+                return lines, publish_team(path, True)
+
+    with PROFILER.stage(f"shards:{team}", rows_in=len(changed)):
+        shard_bytes = 0
+        for y in changed:
+            shard_bytes += write_json(os.path.join(directory, shard_path(y)), doc["years"][y])
+        for y in removed:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(os.path.join(directory, shard_path(y)))
+        _, size = write_manifest(doc, directory, years_data)
+        PROFILER.note(bytes=shard_bytes + size)
+    lines = [f"\nUpdated {manifest_path}: {len(changed)} changed and {len(removed)} removed "
+             f"of {len(years_data)} seasons ({(shard_bytes + size) / 1024:.1f} KB written)"]
+    if changed:
+        lines.append(f"  Re-enriched {', '.join(changed)} ({enriched_batters} batter-seasons, "
+                     f"{enriched_pitchers} pitcher-seasons)")
+
+    if changed or removed:
+        with PROFILER.stage(f"search:{team}", rows_in=len(years_data)):
+            search = build_search_index(years_data)
+            search_path = search_index_path(path)
+            search_kb = write_json(search_path, search) / 1024
+        lines.append(f"Wrote {search_path} ({len(search['players'])} players, "
+                     f"{search_kb:.1f} KB)")
+        lines.append(write_similar(team, path, years_data))
+        with PROFILER.stage(f"columnar:{team}", rows_in=len(years_data)):
+            size = write_columnar(columnar_path(path), years_data)
+            PROFILER.note(bytes=size)
+        lines.append(f"Wrote {columnar_path(path)} ({size / 1024:.1f} KB)")
+
+    with PROFILER.stage(f"json:{team}", rows_in=len(years_data)):
+        # Every season this time, against the same players table
+        if not options["legacy"]:
+            doc = normalize_output(output, state["players"])
+        size = write_json(path, doc)
+        PROFILER.note(bytes=size)
+    lines.append(f"Wrote {path} ({size / 1024:.1f} KB)")
+    if options["sqlite"]:
+        with PROFILER.stage(f"sqlite:{team}", rows_in=len(years_data)):
+            size = write_sqlite(sqlite_path(path), output)
+            PROFILER.note(bytes=size)
+        lines.append(f"Wrote {sqlite_path(path)} ({size / 1024:.1f} KB)")
+
+    state.update(digests=digests, years=years_data, players=doc.get("players"),
+                 manifest=file_digest(manifest_path), sqlite=options["sqlite"])
+    cache_store(f"incremental-{team}", incremental_state_path(team, path), state)
+
+    published = None
+    if options["publish"]:
+        with PROFILER.stage(f"publish:{team}"):
+            published = publish_team(path, True)
+        lines.append(f"Published {len(published[1])} hashed files")
+    return lines, published
+
+
+# Set once per pool worker so the shared Lahman tables are pickled per
+# process rather than per team
+worker_lahman = None
+
+
+def init_worker(lahman, profiling):
+    global worker_lahman
+    worker_lahman = lahman
+    PROFILER.configure(*profiling)
+
+
+def write_team_in_worker(team, source, batting, pitching, config, options):
+    lines, published = write_team(team, source, batting, pitching, worker_lahman,
+                                  config, options)
+    return lines, published, PROFILER.drain()
+
+
+def process(use_cache=True, teams=(HOME_TEAM,), workers=None, shard=False, legacy=False,
+            publish=False, profile=False, profile_stage=None, full_roster=False, sqlite=False,
+            incremental=False):
+    """Build every requested franchise (all in the source when teams is None)
+    from a single scan of each input.  With profile, per-stage timings go to
+    profile_report_path(); profile_stage also runs that stage under cProfile.
+    With full_roster, every player-season in the stats CSVs is included, not
+    just the source's starting lineup.  With sqlite, each team is also
+    written to <output>.sqlite.  incremental implies shard: see
+    update_team()."""
+    options = {"shard": shard or incremental, "legacy": legacy, "publish": publish,
+               "sqlite": sqlite, "incremental": incremental, "full_roster": full_roster}
+    PROFILER.configure(profile, profile_stage, PROFILE_DIR)
+    total = {"started": time.time(), "wall": time.perf_counter(), "cpu": time.process_time()}
+
+    print("Loading source data...")
+    with PROFILER.stage("source"):
+        sources = load_source_teams(SOURCE, teams)
+    if teams is None:
+        teams = sorted(sources)
+
+    with PROFILER.stage("inputs"):
+        batting, pitching, lahman = load_inputs(teams, use_cache, full_roster)
+
+    with PROFILER.stage("derived"):
+        PROFILER.note(rows_out=derive_stats(batting, pitching, lahman))
+
+    jobs = [(team, sources[team], batting.get(team, {}), pitching.get(team, {}),
+             team_config(team, lahman), options) for team in teams]
+
+    if len(jobs) == 1:
+        results = [(*write_team(*job[:4], lahman, *job[4:]), []) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                 initargs=(lahman, PROFILER.settings)) as pool:
+            results = list(pool.map(write_team_in_worker, *zip(*jobs)))
+
+    for lines, _, stages in results:
+        print("\n".join(lines))
+        PROFILER.stages.extend(stages)
+
+    write_asset_manifest({job[0]: (job[4]["output"], options["shard"], published)
+                          for job, (_, published, _) in zip(jobs, results)})
+    if publish and ".br" not in dict(compressed_variants(b"")):
+        print("  Warning: brotli not installed, published .gz variants only")
+    print(f"\nWrote {ASSET_MANIFEST}")
+
+    if profile:
+        total.update(wall_s=round(time.perf_counter() - total.pop("wall"), 4),
+                     cpu_s=round(time.process_time() - total.pop("cpu"), 4),
+                     peak_rss_mb=max([round(peak_rss_mb(), 1)]
+                                     + [rec["peak_rss_mb"] for rec in PROFILER.stages]))
+        write_profile_report(total)
+
+
+# --- Watch mode (--watch) ---
+#
+# Keeps the parsed inputs and every team's enriched seasons in memory and
+# polls the inputs, plus this script for its config tables.  Once a burst of
+# changes settles, only the changed inputs are reloaded (and the derived
+# stats redone if they feed them), only the seasons whose season_digests()
+# moved are re-enriched, and a team's files are rewritten only if its
+# output changed.
+WATCH_INTERVAL = 0.2  # seconds between polls
+WATCH_DEBOUNCE = 0.3  # quiet seconds after the last change before rebuilding
+CONFIG_TABLES = ("WS_WON", "WS_LOST", "ERAS", "ERA_QUOTES", "RETIRED_NUMBERS", "NICKNAMES",
+                 "ON_THIS_DATE", "AWARD_MAP", "TEAMS")
+
+
+def reload_config():
+    """Re-read CONFIG_TABLES from this script as it is on disk now.  Returns
+    the names whose value changed; edits to code still need a restart."""
+    namespace = {"__name__": "extract_yankees_config", "__file__": __file__}
+    with open(__file__, encoding="utf-8") as f:
+        exec(compile(f.read(), __file__, "exec"), namespace)
+    changed = [name for name in CONFIG_TABLES if namespace[name] != globals()[name]]
+    for name in changed:
+        globals()[name] = namespace[name]
+    return changed
+
+
+class Watcher:
+    """Rebuilds teams in-process as their inputs change (see above)."""
+
+    def __init__(self, teams, options, use_cache=True):
+        self.teams = teams
+        self.options = options
+        self.use_cache = use_cache
+        self.built = {}  # team -> (season digests, years_data, output without years)
+
+    def inputs(self):
+        """{path: what to reload when it changes}."""
+        paths = {SOURCE: "source", BATTING_CSV: "batting", PITCHING_CSV: "pitching",
+                 os.path.abspath(__file__): "config"}
+        tables = LAHMAN_TABLES + (["People"] if self.options["full_roster"] else [])
+        for name in tables:
+            paths[os.path.join(LAHMAN_DIR, f"{name}.RData")] = name
+        return paths
+
+    def load(self):
+        """Every input, as process() loads them."""
+        print("Loading source data...")
+        self.sources = load_source_teams(SOURCE, self.teams)
+        if self.teams is None:
+            self.teams = sorted(self.sources)
+        self.batting, self.pitching, self.lahman = load_inputs(
+            self.teams, self.use_cache, self.options["full_roster"])
+        derive_stats(self.batting, self.pitching, self.lahman)
+
+    def reload(self, changed):
+        """Reload just the inputs named in changed (inputs() values)."""
+        params = tuple(self.teams)
+        if "config" in changed:
+            tables = reload_config()
+            print(f"  Reloaded {', '.join(tables) or 'no changed config tables'} "
+                  f"from {os.path.basename(__file__)}")
+            if "AWARD_MAP" in tables:
+                changed.add("AwardsPlayers")
+        if "source" in changed:
+            self.sources = load_source_teams(SOURCE, self.teams)
+        if "batting" in changed:
+            self.batting = load_csv_stats("batting", BATTING_CSV, load_batting_stats,
+                                          self.use_cache, params)
+        if "pitching" in changed:
+            self.pitching = load_csv_stats("pitching", PITCHING_CSV, load_pitching_stats,
+                                           self.use_cache, params)
+        for name in LAHMAN_TABLES:
+            if name in changed:
+                self.lahman.update(RDATA_LOADERS[name]())
+        if "People" in changed:
+            self.lahman["people"] = load_people()
+        if changed & {"batting", "pitching", "Teams"}:
+            derive_stats(self.batting, self.pitching, self.lahman)
+
+    def build(self):
+        """Bring every team's files up to date with the inputs in memory."""
+        built = {}
+        for team in self.teams:
+            source = self.sources.get(team)
+            if source is None:
+                print(f"  Warning: {team} is no longer in {SOURCE}, keeping its last build")
+                continue
+            batting = self.batting.get(team, {})
+            pitching = self.pitching.get(team, {})
+            config = team_config(team, self.lahman)
+            digests = season_digests(source, batting, pitching, self.lahman, config)
+            old_digests, old_years, old_rest = self.built.get(team, ({}, {}, None))
+
+            changed = [y for y in digests if old_digests.get(y) != digests[y]]
+            fresh, enriched_batters, enriched_pitchers = enrich_years(
+                {"years": {y: source["years"][y] for y in changed}}, batting, pitching,
+                self.lahman, config, self.lahman.get("people"))
+            years_data = {y: fresh[y] if y in fresh else old_years[y]
+                          for y in sorted(digests, key=int)}
+            leaderboards = (build_leaderboards(years_data, self.lahman)
+                            if changed or len(years_data) != len(old_years)
+                            else old_rest["leaderboards"])
+            output = assemble_output(team, years_data, leaderboards, self.lahman, config)
+            rest = {k: v for k, v in output.items() if k != "years"}
+            self.built[team] = (digests, years_data, rest)
+            if rest == old_rest and not changed and len(years_data) == len(old_years):
+                print(f"\n{team} is unchanged")
+                continue
+
+            lines, assets = write_output(team, output, self.lahman, config, self.options,
+                                         (enriched_batters, enriched_pitchers))
+            built[team] = (config["output"], self.options["shard"], assets)
+            print("\n".join(lines))
+
+        if built:
+            write_asset_manifest(built)
+            print(f"\nWrote {ASSET_MANIFEST}")
+
+    def run(self, interval=WATCH_INTERVAL, debounce=WATCH_DEBOUNCE):
+        """Build once, then rebuild after each settled burst of changes
+        until interrupted."""
+        inputs = self.inputs()
+        seen = {path: input_signature(path) for path in inputs}
+        self.load()
+        self.build()
+        print(f"\nWatching {len(inputs)} inputs for changes (Ctrl-C to stop)...")
+
+        pending = set()
+        last_change = 0.0
+        while True:
+            time.sleep(interval)
+            for path, what in inputs.items():
+                signature = input_signature(path)
+                if signature != seen[path]:
+                    seen[path] = signature
+                    pending.add(what)
+                    last_change = time.monotonic()
+            if not pending or time.monotonic() - last_change < debounce:
+                continue
+
+            start = time.perf_counter()
+            print(f"\nChanged: {', '.join(sorted(pending))}")
+            try:
+                self.reload(pending)
+                self.build()
+            except Exception as e:
+                # A half-saved file usually; its next save triggers another try
+                print(f"  Error: rebuild failed, keeping the last good output: {e!r}")
+            else:
+                print(f"Rebuilt in {time.perf_counter() - start:.2f}s")
+            pending = set()
+
+
+def watch(use_cache=True, teams=(HOME_TEAM,), shard=False, legacy=False, publish=False,
+          full_roster=False, sqlite=False):
+    """Build like process(), then keep rebuilding as inputs change."""
+    options = {"shard": shard, "legacy": legacy, "publish": publish, "sqlite": sqlite,
+               "incremental": False, "full_roster": full_roster}
+    try:
+        Watcher(teams, options, use_cache).run()
+    except KeyboardInterrupt:
+        pass
 
 
 if __name__ == "__main__":
-    process()
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--no-cache", action="store_true",
+                        help="re-parse every input instead of using the build cache")
+    parser.add_argument("--teams", default=HOME_TEAM,
+                        help=f"comma-separated teamIDs to build, or 'all' (default: {HOME_TEAM})")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="process pool size for multi-team builds (default: CPU count)")
+    parser.add_argument("--shard", action="store_true",
+                        help="also write a manifest plus one file per season for lazy loading")
+    parser.add_argument("--legacy-layout", action="store_true",
+                        help="write the old denormalized shape (bio fields repeated per season)")
+    parser.add_argument("--publish", action="store_true",
+                        help="write content-hashed, precompressed copies listed in asset-manifest.json")
+    parser.add_argument("--profile", action="store_true",
+                        help="record per-stage wall/CPU time, peak RSS and row counts "
+                             "to build-profile.json in --profile-dir")
+    parser.add_argument("--profile-dir", default=PROFILE_DIR, metavar="DIR",
+                        help="where --profile writes its report and cProfile dumps "
+                             "(default: scripts/.cache/profile)")
+    parser.add_argument("--profile-stage", metavar="STAGE",
+                        help="with --profile, also run STAGE (e.g. 'csv:Batting' or 'enrich') "
+                             "under cProfile")
+    parser.add_argument("--full-roster", action="store_true",
+                        help="include bench players and relievers from the stats CSVs "
+                             "(names from People.RData)")
+    parser.add_argument("--sqlite", action="store_true",
+                        help="also write an indexed SQLite database next to the output")
+    parser.add_argument("--incremental", action="store_true",
+                        help="with the state of the last run, rebuild only the seasons whose "
+                             "inputs changed (implies --shard)")
+    parser.add_argument("--watch", action="store_true",
+                        help="keep running and rebuild whatever the changed inputs, Lahman "
+                             "files or config tables in this script affect")
+    parser.add_argument("--archive", action="append", default=[], metavar="PATH",
+                        help="read Batting.csv, Pitching.csv and the Lahman .RData tables "
+                             "from this zip or tar archive (at any depth) instead of loose "
+                             "files; repeatable")
+    args = parser.parse_args()
+    ARCHIVES = args.archive
+    PROFILE_DIR = args.profile_dir
+    teams = None if args.teams == "all" else [t.strip() for t in args.teams.split(",")]
+    if args.watch:
+        if args.incremental or args.profile or args.profile_stage:
+            parser.error("--watch keeps its own state; drop --incremental and --profile")
+        watch(use_cache=not args.no_cache, teams=teams, shard=args.shard,
+              legacy=args.legacy_layout, publish=args.publish, full_roster=args.full_roster,
+              sqlite=args.sqlite)
+    else:
+        process(use_cache=not args.no_cache, teams=teams, workers=args.workers,
+                shard=args.shard, legacy=args.legacy_layout, publish=args.publish,
+                profile=args.profile or bool(args.profile_stage),
+                profile_stage=args.profile_stage, full_roster=args.full_roster,
+                sqlite=args.sqlite, incremental=args.incremental)
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""Serve one franchise's data as small JSON answers instead of the whole
+yankees.json.
+
+Builds the team in memory exactly as extract_yankees.py does (same inputs,
+same build cache), indexes it once, then answers
+
+    /year/{yearID}       one season's roster, record and World Series result
+    /player/{playerID}   a player's bio fields and every season on the roster
+    /search?q=           name/nickname search, same rules as js/data.js
+    /leaders/{key}       one leaderboard, e.g. careerHR
+
+on a local asyncio HTTP/1.1 server.  Response bodies are cached in an LRU
+with their ETag (a hash of the body), so a revalidating client gets a 304.
+Standard library only; nothing outside this machine is contacted."""
+
+import argparse
+import asyncio
+import functools
+import gzip
+import hashlib
+import json
+import time
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import extract_yankees as ey
+
+MAX_RESULTS = 50  # matches MAX_RESULTS in js/data.js
+CACHE_SIZE = 4096
+GZIP_MIN_BYTES = 1024
+MAX_HEADER_BYTES = 16 * 1024
+IDLE_TIMEOUT = 15  # seconds a keep-alive connection may sit between requests
+
+REASONS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed"}
+
+
+def build(team, use_cache=True, full_roster=False):
+    """One franchise's output document, built in memory like process()."""
+    print("Loading source data...")
+    sources = ey.load_source_teams(ey.SOURCE, [team])
+    batting, pitching, lahman = ey.load_inputs([team], use_cache, full_roster)
+    ey.derive_stats(batting, pitching, lahman)
+    output, _, _ = ey.build_team(team, sources[team], batting.get(team, {}),
+                                 pitching.get(team, {}), lahman, ey.team_config(team, lahman))
+    return output
+
+
+class Dataset:
+    """Indexes over one built team, queried by path.  Every answer is a
+    plain dict; Server turns it into cached bytes."""
+
+    def __init__(self, output):
+        self.output = output
+        self.years = output["years"]
+        self.leaderboards = output["leaderboards"]
+        self.search = ey.build_search_index(self.years)
+        self.players = self.index_players()
+
+    def index_players(self):
+        """{playerID: {bio fields..., "seasons": [{year, pos, role, ...}]}}
+        in one pass over the rosters, seasons oldest first."""
+        players = {}
+        for year_str, roster in sorted(self.years.items(), key=lambda x: int(x[0])):
+            for pos, role, entry in ey.roster_entries(roster):
+                pid = entry.get("playerID")
+                if not pid:
+                    continue
+                rec = players.get(pid)
+                if rec is None:
+                    rec = players[pid] = {"playerID": pid, "seasons": []}
+                for field in ey.BIO_FIELDS:
+                    if field in entry:
+                        rec[field] = entry[field]
+                season = {k: v for k, v in entry.items()
+                          if k != "playerID" and k not in ey.BIO_FIELDS}
+                rec["seasons"].append({"year": int(year_str), "pos": pos, "role": role, **season})
+        for rec in players.values():
+            rec["seasons"] = rec.pop("seasons")  # after the bio fields
+        return players
+
+    def year(self, year_str):
+        roster = self.years.get(year_str)
+        if roster is None:
+            return None
+        return {"year": int(year_str), "team": self.output["team"],
+                "record": self.output["seasonRecords"].get(year_str), **roster}
+
+    def player(self, pid):
+        return self.players.get(pid)
+
+    def leaders(self, key):
+        entries = self.leaderboards.get(key)
+        return None if entries is None else {"key": key, "entries": entries}
+
+    def find(self, query):
+        """Players matching query, most seasons first: word prefixes for 1-2
+        characters, trigram posting lists for longer queries (searchIndex()
+        in js/data.js)."""
+        q = ey.normalize_name(query)
+        index = self.search
+        if not q:
+            hits = []
+        elif len(q) < 3:
+            hits = index["prefixes"].get(q, [])
+        else:
+            lists = [index["grams"].get(q[i:i + 3]) for i in range(len(q) - 2)]
+            if all(lists):
+                hits = functools.reduce(
+                    lambda a, b: sorted(set(a).intersection(b)), sorted(lists, key=len))
+                hits = [i for i in hits if q in index["players"][i]["key"]]
+            else:
+                hits = []
+        results = [{"id": rec["id"], "name": rec["name"], "apps": rec["apps"],
+                    "awards": rec["awards"]}
+                   for rec in (index["players"][i] for i in hits[:MAX_RESULTS])]
+        return {"query": query, "results": results}
+
+
+async def discard(reader, length, chunk=1 << 16):
+    """Read and drop length bytes of a request body; False if the client
+    stopped sending first."""
+    while length > 0:
+        try:
+            data = await asyncio.wait_for(reader.read(min(length, chunk)), IDLE_TIMEOUT)
+        except (asyncio.TimeoutError, ConnectionError):
+            return False
+        if not data:
+            return False
+        length -= len(data)
+    return True
+
+
+class Server:
+    """Routes requests to a Dataset and caches the encoded responses."""
+
+    def __init__(self, dataset, cache_size=CACHE_SIZE):
+        self.dataset = dataset
+        self.render = functools.lru_cache(maxsize=cache_size)(self.render_uncached)
+
+    def route(self, path, query):
+        """Return (status, payload) for a GET."""
+        parts = [unquote(p) for p in path.strip("/").split("/")]
+        if parts[0] == "search" and len(parts) == 1:
+            return 200, self.dataset.find(query.get("q", [""])[0])
+        if len(parts) != 2:
+            return 404, {"error": f"unknown path {path}"}
+        kind, key = parts
+        lookup = {"year": self.dataset.year, "player": self.dataset.player,
+                  "leaders": self.dataset.leaders}.get(kind)
+        payload = lookup(key) if lookup else None
+        if payload is None:
+            return 404, {"error": f"no {kind} {key!r}" if lookup else f"unknown path {path}"}
+        return 200, payload
+
+    def render_uncached(self, target):
+        """(status, body, gzipped body or None, etag) for a request target."""
+        url = urlsplit(target)
+        status, payload = self.route(url.path, parse_qs(url.query))
+        body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+        compressed = gzip.compress(body, mtime=0) if len(body) >= GZIP_MIN_BYTES else None
+        return status, body, compressed, etag
+
+    def respond(self, method, target, headers):
+        """Status, headers and body bytes for one request."""
+        if method not in ("GET", "HEAD"):
+            status, body, compressed, etag = 405, b'{"error":"GET only"}', None, None
+        else:
+            status, body, compressed, etag = self.render(target)
+
+        out = {"Content-Type": "application/json; charset=utf-8",
+               "Access-Control-Allow-Origin": "*",
+               "Cache-Control": "no-cache"}
+        if etag:
+            out["ETag"] = etag
+            if status == 200 and etag in headers.get("if-none-match", ""):
+                return 304, out, b""
+        if compressed is not None and "gzip" in headers.get("accept-encoding", ""):
+            body = compressed
+            out["Content-Encoding"] = "gzip"
+            out["Vary"] = "Accept-Encoding"
+        out["Content-Length"] = str(len(body))
+        return status, out, b"" if method == "HEAD" else body
+
+    async def handle(self, reader, writer):
+        """Serve requests on one connection until it closes or idles out."""
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), IDLE_TIMEOUT)
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError,
+                        asyncio.TimeoutError, ConnectionError):
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                request = lines[0].split(" ")
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(":")
+                    if name:
+                        headers[name.strip().lower()] = value.strip()
+
+                if len(request) != 3 or not request[1].startswith("/"):
+                    status, out, body = 400, {"Content-Length": "0"}, b""
+                    keep_alive = False
+                else:
+                    method, target, version = request
+                    connection = headers.get("connection", "").lower()
+                    keep_alive = (connection != "close" if version == "HTTP/1.1"
+                                  else connection == "keep-alive")
+                    # No route reads a body, but one left unread would be
+                    # parsed as the next request: drop it, or close after
+                    # answering when its length isn't known up front
+                    length = headers.get("content-length", "0")
+                    if "transfer-encoding" in headers or not length.isdigit():
+                        keep_alive = False
+                    elif keep_alive and not await discard(reader, int(length)):
+                        break
+                    status, out, body = self.respond(method, target, headers)
+                out["Connection"] = "keep-alive" if keep_alive else "close"
+                writer.write(f"HTTP/1.1 {status} {REASONS[status]}\r\n".encode("latin-1")
+                             + "".join(f"{k}: {v}\r\n" for k, v in out.items()).encode("latin-1")
+                             + b"\r\n" + body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(server, host, port):
+    listener = await asyncio.start_server(server.handle, host, port, limit=MAX_HEADER_BYTES,
+                                          backlog=1024)
+    for sock in listener.sockets:
+        print(f"Serving on http://{sock.getsockname()[0]}:{sock.getsockname()[1]}/")
+    async with listener:
+        await listener.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--team", default=ey.HOME_TEAM,
+                        help=f"teamID to serve (default: {ey.HOME_TEAM})")
+    parser.add_argument("--host", default="127.0.0.1", help="address to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8001, help="port to listen on (default: 8001)")
+    parser.add_argument("--cache-size", type=int, default=CACHE_SIZE,
+                        help=f"responses kept in the LRU cache (default: {CACHE_SIZE})")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="re-parse every input instead of using the build cache")
+    parser.add_argument("--full-roster", action="store_true",
+                        help="include bench players and relievers, as extract_yankees.py does")
+    parser.add_argument("--archive", action="append", default=[], metavar="PATH",
+                        help="read the Lahman inputs from this zip or tar archive, as "
+                             "extract_yankees.py does")
+    args = parser.parse_args()
+    ey.ARCHIVES = args.archive
+
+    start = time.perf_counter()
+    dataset = Dataset(build(args.team, not args.no_cache, args.full_roster))
+    print(f"Indexed {len(dataset.years)} seasons, {len(dataset.players)} players "
+          f"in {time.perf_counter() - start:.1f}s")
+    try:
+        asyncio.run(serve(Server(dataset, args.cache_size), args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""An --incremental update must leave the sharded output exactly as a full
+--shard build of the same inputs would.
+
+Runs on a few seasons of benchmark.py's synthetic inputs:
+
+    python -m unittest discover scripts"""
+
+import contextlib
+import io
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+import benchmark
+import extract_yankees as ey
+
+
+class IncrementalTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        with mock.patch.multiple(benchmark, FIRST_YEAR=1990, LAST_YEAR=2000, CLUBS_PER_YEAR=2), \
+                contextlib.redirect_stdout(io.StringIO()):
+            self.inputs = benchmark.generate(os.path.join(self.dir, "inputs"), 1)
+        self.build("incremental", incremental=True)
+
+    def build(self, name, **options):
+        """Run process() into DATA_DIR <tmp>/<name>; returns its log."""
+        data = os.path.join(self.dir, name)
+        log = io.StringIO()
+        with mock.patch.multiple(
+                ey, SOURCE=self.inputs["source"], BATTING_CSV=self.inputs["batting"],
+                PITCHING_CSV=self.inputs["pitching"], LAHMAN_DIR=self.inputs["lahman"],
+                ARCHIVES=[], CACHE_DIR=os.path.join(self.dir, "cache"), DATA_DIR=data,
+                OUTPUT=os.path.join(data, "yankees.json"),
+                TEAMS_OUTPUT_DIR=os.path.join(data, "teams"),
+                ASSET_MANIFEST=os.path.join(data, "asset-manifest.json")), \
+                contextlib.redirect_stdout(log):
+            ey.process(**options)
+        return log.getvalue()
+
+    def sharded_output(self, name):
+        """{path: bytes} of everything an incremental update keeps current."""
+        data = os.path.join(self.dir, name)
+        files = {}
+        for root, _, names in os.walk(os.path.join(data, "yankees")):
+            for file in names:
+                path = os.path.join(root, file)
+                with open(path, "rb") as f:
+                    files[os.path.relpath(path, data)] = f.read()
+        for file in ("yankees.json", "yankees.columns.bin", "yankees-search.json",
+                     "yankees-similar.json"):
+            with open(os.path.join(data, file), "rb") as f:
+                files[file] = f.read()
+        return files
+
+    def assert_matches_full_build(self):
+        self.build("full", shard=True)
+        incremental, full = self.sharded_output("incremental"), self.sharded_output("full")
+        self.assertEqual(sorted(incremental), sorted(full))
+        for path in full:
+            self.assertEqual(incremental[path], full[path], path)
+
+    def sqlite_dump(self, name):
+        db = sqlite3.connect(os.path.join(self.dir, name, "yankees.sqlite"))
+        try:
+            return list(db.iterdump())
+        finally:
+            db.close()
+
+    def edit_teams(self, edit):
+        """Apply edit(DataFrame) to the synthetic Teams.RData."""
+        import pyreadr
+
+        path = os.path.join(self.inputs["lahman"], "Teams.RData")
+        teams = pyreadr.read_r(path)["Teams"]
+        edit(teams)
+        pyreadr.write_rdata(path, teams, df_name="Teams")
+
+    def test_unchanged_inputs(self):
+        log = self.build("incremental", incremental=True)
+        self.assertIn("is up to date", log)
+        self.assert_matches_full_build()
+
+    def test_changed_season(self):
+        pid = benchmark.player_id("NYA", "b", 0, 1995)
+        with open(self.inputs["batting"]) as f:
+            lines = f.read().splitlines(keepends=True)
+        for i, line in enumerate(lines):
+            if line.startswith(f"{pid},1995,"):
+                cells = line.rstrip("\n").split(",")
+                cells[benchmark.BATTING_HEADER.index("HR")] = "99"
+                lines[i] = ",".join(cells) + "\n"
+        with open(self.inputs["batting"], "w") as f:
+            f.writelines(lines)
+
+        log = self.build("incremental", incremental=True)
+        self.assertIn("Re-enriched 1995 ", log)
+        self.assert_matches_full_build()
+
+    def test_team_records_and_name(self):
+        # Neither is part of a season's digest; both are in the manifest
+        def edit(teams):
+            nya = teams["teamID"] == "NYA"
+            teams.loc[nya & (teams["yearID"] == 1995), ["W", "L"]] = [101, 53]
+            teams.loc[nya, "name"] = "Renamed Club"
+
+        self.edit_teams(edit)
+        log = self.build("incremental", incremental=True)
+        self.assertIn("0 changed and 0 removed", log)
+        self.assert_matches_full_build()
+
+    def test_sqlite(self):
+        # First asked for after the full build, so written with no season changed
+        log = self.build("incremental", incremental=True, sqlite=True)
+        self.assertIn("yankees.sqlite", log)
+        self.build("full", shard=True, sqlite=True)
+        self.assertEqual(self.sqlite_dump("incremental"), self.sqlite_dump("full"))
+        log = self.build("incremental", incremental=True, sqlite=True)
+        self.assertIn("is up to date", log)
+
+
+if __name__ == "__main__":
+    unittest.main()